@@ -0,0 +1,95 @@
+"""Benchmark waktu parse per halaman untuk setiap backend html_parser.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_html_parser
+    python -m benchmarks.bench_html_parser --file halaman_hrdkorea.html
+
+Tanpa --file dipakai payload sintetis yang meniru struktur tabel hrdkorea
+(baris `tr[id^='tr_']` di dalam `table.tableType` + navigasi halaman) dan
+fragmen judul kp2mi dari data/get_info.json.
+"""
+
+import argparse
+import json
+import time
+
+from bs4 import BeautifulSoup
+
+from utils.constants import PENGUMUMAN_FILE
+from utils.eps_boards import ROW_SELECTOR
+from utils.html_parser import available_backends, extract_anchor, select_rows
+
+
+def halaman_hrdkorea(jumlah_baris=10, padding=400):
+    nav = "".join(
+        f'<li><a href="/epstopik/menu{i}.do">Menu {i}</a></li>' for i in range(padding)
+    )
+    baris = "".join(
+        f"<tr id='tr_{i}'><td>Indonesia</td>"
+        f"<td><a href='#'>Indonesia the {i}th Test of proficiency in Korean(General)</a></td>"
+        f"<td>General (CBT)</td><td>2025-10-{i % 28 + 1:02d}</td></tr>"
+        for i in range(jumlah_baris)
+    )
+    return (
+        "<html><head><title>EPS-TOPIK</title></head><body>"
+        f"<ul class='gnb'>{nav}</ul>"
+        f"<table class='tableType'><tr><th>Nation</th><th>Title</th></tr>{baris}</table>"
+        "</body></html>"
+    )
+
+
+def fragmen_kp2mi():
+    try:
+        with open(PENGUMUMAN_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        items = [{"judul": "PENGUMUMAN", "link": "/gtog-detail/korea/x"}] * 10
+    return [
+        f'<a href="{item["link"]}" target="_blank">{item["judul"]}</a>'
+        for item in items
+    ]
+
+
+def ukur(fn, ulang):
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        fn()
+    return (time.perf_counter() - mulai) / ulang * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", help="HTML halaman hrdkorea yang disimpan")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            page = f.read()
+    else:
+        page = halaman_hrdkorea()
+
+    print(f"Halaman hrdkorea: {len(page) / 1024:.1f} KiB, ulang {args.repeat}x")
+    for backend in available_backends():
+        rows = select_rows(page, ROW_SELECTOR, backend=backend)
+        ms = ukur(lambda: select_rows(page, ROW_SELECTOR, backend=backend), args.repeat)
+        print(f"  {backend:<12} {ms:8.3f} ms/halaman  ({len(rows)} baris)")
+
+    fragmen = fragmen_kp2mi()
+    ulang = args.repeat * 20
+    print(f"\nFragmen judul kp2mi: {len(fragmen)} baris/halaman, ulang {ulang}x")
+
+    def via_soup():
+        for frag in fragmen:
+            BeautifulSoup(frag, "html.parser").find("a")
+
+    def via_regex():
+        for frag in fragmen:
+            extract_anchor(frag)
+
+    print(f"  {'html.parser':<12} {ukur(via_soup, ulang):8.3f} ms/halaman")
+    print(f"  {'regex':<12} {ukur(via_regex, ulang):8.3f} ms/halaman")
+
+
+if __name__ == "__main__":
+    main()
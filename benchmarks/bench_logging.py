@@ -0,0 +1,94 @@
+"""Benchmark biaya logging per pesan di sisi pemanggil (event loop).
+
+Membandingkan konfigurasi lama (FileHandler sinkron di root logger) dengan
+setup_logging (QueueHandler + QueueListener, JSON, sampling). Log ditulis ke
+folder sementara.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_logging
+    python -m benchmarks.bench_logging --messages 50000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from utils import logging_setup
+
+
+def log_per_pesan(logger, jumlah: int):
+    # Pola jalur panas: satu INFO per pesan/link dengan f-string
+    for i in range(jumlah):
+        logger.info(f"🔗 Ditemukan link: https://contoh.id/{i}")
+
+
+def konfigurasi_lama(folder: str):
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    for nama, level in (("log.txt", logging.NOTSET), ("error.log", logging.ERROR)):
+        handler = logging.FileHandler(os.path.join(folder, nama), encoding="utf-8")
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+
+def bersihkan():
+    logging_setup.stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers:
+        handler.close()
+    root.handlers.clear()
+
+
+def ukur(nama: str, jumlah: int, selesai=None):
+    logger = logging.getLogger("bench")
+    mulai = time.perf_counter()
+    log_per_pesan(logger, jumlah)
+    durasi = time.perf_counter() - mulai
+    drain = 0.0
+    if selesai:
+        mulai = time.perf_counter()
+        selesai()
+        drain = time.perf_counter() - mulai
+    print(
+        f"  {nama:<22} {durasi * 1e6 / jumlah:8.2f} µs/pesan di pemanggil"
+        f"  (antrean dikosongkan {drain * 1000:7.1f} ms)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    asal = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)  # LOG_DIR relatif → logs/ di folder sementara
+        try:
+            print(f"{args.messages} log INFO dari satu lokasi")
+
+            os.makedirs("lama", exist_ok=True)
+            konfigurasi_lama("lama")
+            ukur("sinkron (lama)", args.messages)
+            bersihkan()
+
+            logging_setup.setup_logging(console=False)
+            for f in logging.getLogger().handlers[0].filters:
+                f.burst = float("inf")  # tanpa sampling
+            ukur("antrean", args.messages, logging_setup.stop_logging)
+            bersihkan()
+
+            logging_setup.setup_logging(console=False)
+            ukur("antrean + sampling", args.messages, logging_setup.stop_logging)
+            print(f"  sampling: {args.messages - logging_setup.SAMPLE_BURST} dibuang")
+            bersihkan()
+        finally:
+            os.chdir(asal)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark pencocokan kata kunci moderasi: loop `any(... in ...)` vs automaton.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_moderasi
+    python -m benchmarks.bench_moderasi --scale 50 --messages 20000
+
+Kata kunci diambil dari data/moderation_keywords.json lalu diperbanyak
+`--scale` kali dengan variasi sintetis untuk mensimulasikan daftar yang tumbuh.
+"""
+
+import argparse
+import json
+import random
+import re
+import string
+import time
+
+from utils.constants import MODERATION_FILE
+from utils.keyword_matcher import KeywordMatcher
+from utils.moderation_tokenizer import ModerationMatcher
+
+
+def clean_text(text: str) -> str:
+    return re.sub(r"[^\w\s]", "", text.lower())
+
+
+def muat_kategori(scale: int) -> dict:
+    with open(MODERATION_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    rng = random.Random(42)
+    kategori = {}
+    for nama in ("BAN_KEYWORDS", "BAD_WORDS", "SENSITIF"):
+        kata = list(data.get(nama, []))
+        for _ in range(len(kata) * (scale - 1)):
+            kata.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))))
+        kategori[nama] = kata
+    return kategori
+
+
+def buat_pesan(jumlah: int) -> list:
+    rng = random.Random(7)
+    kosakata = (
+        "halo kak mau tanya jadwal ujian eps topik kapan ya terima kasih "
+        "semangat belajar korea hasil tahap satu sudah keluar belum info link "
+        "daftar pengumuman cbt ubt nilai lulus"
+    ).split()
+    return [
+        " ".join(rng.choices(kosakata, k=rng.randint(3, 40))) for _ in range(jumlah)
+    ]
+
+
+# (pesan, kata kunci tambahan seperti dari /tambahkata, kena?)
+KASUS = [
+    ("harga b3ras naik", [], False),  # potongan "ras" tidak boleh jadi token
+    ("k3ras banget", [], False),
+    ("s l o t gacor", [], True),
+    ("main slot88 yuk", ["slot88"], True),  # kata kunci berangka di tengah pesan
+    ("main sl0t88 yuk", ["slot88"], True),
+]
+
+
+def cek_kasus():
+    with open(MODERATION_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    gagal = 0
+    for teks, tambahan, harap in KASUS:
+        kategori = {
+            nama: list(data.get(nama, [])) for nama in ("BAN_KEYWORDS", "SENSITIF")
+        }
+        kategori["TAMBAHAN"] = tambahan
+        hits = ModerationMatcher(kategori).find(teks)
+        ok = bool(hits) == harap
+        gagal += not ok
+        print(f"  {'✓' if ok else '✗'} {teks!r}: {sorted(hits) or '-'}")
+    if gagal:
+        raise SystemExit(f"{gagal} kasus tokenizer tidak sesuai")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    print("Kasus tokenizer")
+    cek_kasus()
+
+    kategori = muat_kategori(args.scale)
+    mentah = buat_pesan(args.messages)
+    pesan = [clean_text(p) for p in mentah]
+    total_kata = sum(len(v) for v in kategori.values())
+    print(f"{total_kata} kata kunci, {len(pesan)} pesan")
+
+    def cara_lama():
+        for clean in pesan:
+            for kata_list in kategori.values():
+                any(k in clean for k in kata_list)
+
+    mulai = time.perf_counter()
+    matcher = KeywordMatcher(kategori)
+    build_ms = (time.perf_counter() - mulai) * 1000
+
+    def automaton():
+        for clean in pesan:
+            matcher.find(clean)
+
+    moderation = ModerationMatcher(kategori)
+
+    def tokenizer():
+        # Termasuk biaya normalisasi (leet/homoglyph/tokenisasi) per pesan
+        for teks in mentah:
+            moderation.find(teks)
+
+    for nama, fn in (
+        ("loop any()", cara_lama),
+        ("aho-corasick", automaton),
+        ("tokenizer+ac", tokenizer),
+    ):
+        mulai = time.perf_counter()
+        fn()
+        durasi = time.perf_counter() - mulai
+        print(
+            f"  {nama:<14} {durasi * 1e6 / len(pesan):8.2f} µs/pesan "
+            f"({len(pesan) / durasi:,.0f} pesan/detik)"
+        )
+    print(f"  build automaton {build_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
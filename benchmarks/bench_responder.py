@@ -0,0 +1,152 @@
+"""Benchmark pencarian kategori responder: difflib per pesan vs index trigram.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_responder
+    python -m benchmarks.bench_responder --scale 50 --messages 20000
+
+Kunci diambil dari data/respon.json lalu diperbanyak `--scale` kali dengan
+kunci sintetis untuk mensimulasikan file respon yang tumbuh. Sebelum
+mengukur, beberapa pesan contoh dicek terhadap kategori yang diharapkan
+(keluar dengan error jika index trigram salah).
+"""
+
+import argparse
+import difflib
+import json
+import random
+import string
+import time
+
+from utils.constants import RESPON_FILE
+from utils.intent_matcher import IntentMatcher
+
+# Rantai `if "..." in text` lama (urutan = prioritas), sama dengan ALIAS responder
+RANTAI = {
+    "kata_hari_ini": ["kata hari ini", "word of the day"],
+    "tebakan": ["tebakan"],
+    "pujian": ["puji"],
+    "marah": ["marah"],
+    "penyemangat": ["semangat", "support dong"],
+    "ngambek_parah": ["ngambek"],
+    "motivasi_korea": ["motivasi korea"],
+}
+ALIAS = {**RANTAI, "belajar_korea": ["korea"]}
+
+# (pesan, kategori yang diharapkan)
+KASUS = [
+    ("halo", "halo"),
+    ("halo!", "halo"),
+    ("halo?", "halo"),
+    ("halo.", "halo"),
+    ("halo,", "halo"),
+    ("Apa kabar?", "apa kabar"),
+    ("jangan marahin aku", "marah"),
+    ("kasih motivasi korea dong", "motivasi_korea"),
+    ("aku mau belajar korea", "belajar_korea"),
+    ("random xyz", None),
+]
+
+
+def kategori_lama(teks: str, kunci: list):
+    """Jalur lama: rantai `in`, daftar kandidat dibangun ulang, difflib."""
+    teks = teks.lower()
+    for kategori, frasa in RANTAI.items():
+        if any(f in teks for f in frasa):
+            return kategori
+    pesan_norm = " ".join(teks.strip().split())
+    kandidat = [(k, k.replace("_", " ")) for k in kunci if k != "mood_swing"]
+    semua_teks = [item[1] for item in kandidat]
+    cocok = difflib.get_close_matches(pesan_norm, semua_teks, n=1, cutoff=0.7)
+    if cocok:
+        for k, t in kandidat:
+            if t == cocok[0]:
+                return k
+    if "korea" in pesan_norm:
+        return "belajar_korea"
+    return None
+
+
+def buat_matcher(kunci: list) -> IntentMatcher:
+    phrases = {k: [k.replace("_", " ")] for k in kunci if k != "mood_swing"}
+    return IntentMatcher(phrases, aliases=ALIAS)
+
+
+def cek_kasus(kunci: list):
+    matcher = buat_matcher(kunci)
+    gagal = 0
+    for teks, harap in KASUS:
+        lama = kategori_lama(teks, kunci)
+        baru = matcher.match(teks)
+        ok = baru == harap
+        gagal += not ok
+        print(f"  {'✓' if ok else '✗'} {teks!r}: difflib={lama} trigram={baru}")
+    if gagal:
+        raise SystemExit(f"{gagal} kasus intent tidak sesuai")
+
+
+def muat_kunci(scale: int) -> list:
+    with open(RESPON_FILE, "r", encoding="utf-8") as f:
+        kunci = list(json.load(f))
+    rng = random.Random(42)
+    for _ in range(len(kunci) * (scale - 1)):
+        kata = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        kunci.append("_".join(kata))
+    return kunci
+
+
+def buat_pesan(kunci: list, jumlah: int) -> list:
+    rng = random.Random(7)
+    kosakata = (
+        "halo kak bot mau tanya dong kamu lagi apa aku capek hari ini "
+        "semangat belajar korea makasih ya kenapa sih siapa"
+    ).split()
+    asli = [k.replace("_", " ") for k in kunci if k != "mood_swing"]
+    pesan = []
+    for _ in range(jumlah):
+        kata = rng.choices(kosakata, k=rng.randint(1, 12))
+        if rng.random() < 0.5:
+            # Sisipkan frasa kunci di tengah pesan
+            kata.insert(rng.randint(0, len(kata)), rng.choice(asli))
+        pesan.append(" ".join(kata))
+    return pesan
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    print("Kasus (kunci asli respon.json)")
+    cek_kasus(muat_kunci(1))
+
+    kunci = muat_kunci(args.scale)
+    pesan = buat_pesan(kunci, args.messages)
+    print(f"{len(kunci)} kunci respon, {len(pesan)} pesan")
+
+    def cara_lama():
+        return sum(1 for teks in pesan if kategori_lama(teks, kunci))
+
+    mulai = time.perf_counter()
+    matcher = buat_matcher(kunci)
+    build_ms = (time.perf_counter() - mulai) * 1000
+
+    def trigram():
+        return sum(1 for teks in pesan if matcher.match(teks))
+
+    for nama, fn in (("difflib", cara_lama), ("index trigram", trigram)):
+        mulai = time.perf_counter()
+        cocok = fn()
+        durasi = time.perf_counter() - mulai
+        print(
+            f"  {nama:<14} {durasi * 1e6 / len(pesan):8.2f} µs/pesan "
+            f"({len(pesan) / durasi:,.0f} pesan/detik, {cocok} cocok)"
+        )
+    print(f"  build index {build_ms:.2f} ms ({len(matcher)} frasa)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,87 +1,38 @@
 import os
 import logging
-import asyncio
+from datetime import datetime, time as dtime
 from telegram import Update
-from logging.handlers import TimedRotatingFileHandler
-from colorlog import ColoredFormatter
 from dotenv import load_dotenv
-from utils.constants import MONITOR_INFO, MONITOR_PRELIM
 from telegram.ext import (
     Application,
     ContextTypes,
 )
 
+# Logging dipasang sebelum modul lain diimpor: beberapa modul sudah menulis
+# log INFO saat import (store strike, migrasi feed records, dst.)
+from utils.logging_setup import setup_logging, stop_logging
+
+# Satu titik konfigurasi: file JSON, error.log, moderasi/strike, konsol (via antrean)
+setup_logging()
+
 from utils.monitor_utils import (
-    check_api_multi,
     is_waktu_aktif,
-    is_jam_delapan,
     format_pesan,
+    format_edit,
 )
-
+from utils.feed_monitor import FEEDS, run_cycle
+from utils.poll_scheduler import poller
+from utils.http_client import close_client
+from utils import metrics
+from utils.browser_pool import browser_pool
+from utils.snapshot_cache import snapshots
+from utils.persistence import flush_all, FLUSH_INTERVAL
+from utils.raid_detector import raid_detector, format_digest, format_summary
+from utils.outbound import outbound, LANE_BALASAN, LANE_INFO
 from handlers.register_handlers import register_handlers
-
+from handlers.eps_board import format_board_html
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-# Formatter
-color_formatter = ColoredFormatter(
-    "%(log_color)s%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    log_colors={
-        "DEBUG": "cyan",
-        "INFO": "green",
-        "WARNING": "yellow",
-        "ERROR": "red",
-        "CRITICAL": "bold_red",
-    },
-)
-
-file_formatter = logging.Formatter(
-    "%(asctime)s - %(levelname)s - %(message)s", "%Y-%m-%d %H:%M:%S"
-)
-
-# Hapus handler lama
-if logger.hasHandlers():
-    logger.handlers.clear()
-
-# === Buat folder logs/ jika belum ada ===
-try:
-    os.makedirs("logs", exist_ok=True)
-except Exception as e:
-    print(f"[Logger] ⚠️ Gagal membuat folder logs/: {e}")
-    # Fallback ke folder saat ini
-    LOG_PATH = "log.txt"
-    ERROR_LOG_PATH = "error.log"
-else:
-    LOG_PATH = "logs/log.txt"
-    ERROR_LOG_PATH = "logs/error.log"
-
-# Log ke file harian
-file_handler = TimedRotatingFileHandler(
-    "logs/log.txt", when="midnight", backupCount=7, encoding="utf-8"
-)
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
-
-# Log error khusus
-error_handler = logging.FileHandler("logs/error.log", mode="a", encoding="utf-8")
-error_handler.setLevel(logging.ERROR)
-error_handler.setFormatter(file_formatter)
-logger.addHandler(error_handler)
-
-# Log ke terminal
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(color_formatter)
-logger.addHandler(console_handler)
-
-# Matikan log verbose dari lib lain
-for name in [
-    "httpx",
-    "telegram.vendor.ptb_urllib3.urllib3",
-    "telegram.ext._application",
-]:
-    logging.getLogger(name).setLevel(logging.WARNING)
 
 
 def mask_token(token: str) -> str:
@@ -114,67 +65,112 @@ async def get_chat_id(update, context):
     )
 
 
-# ===== JOB Monitoring =====
-async def monitor_job(context: ContextTypes.DEFAULT_TYPE):
+# ===== JOB Sapaan pagi (08:00 waktu server) =====
+async def pagi_job(context: ContextTypes.DEFAULT_TYPE):
     if not is_waktu_aktif():
-        if is_jam_delapan():
-            logger.info("🔔 Waktu monitoring aktif dimulai (08:00 WIB)")
-        logger.info(
-            "⏹️ Lewat jam aktif, monitoring pengumuman & training dihentikan sementara."
-        )
         return
+    logger.info("🔔 Waktu monitoring aktif dimulai (08:00 WIB)")
+    try:
+        await outbound.send(
+            context.bot.send_message,
+            CHAT_ID,
+            chat_id=CHAT_ID,
+            lane=LANE_INFO,
+            message_thread_id=THREAD_ID,
+            text="🕗 Selamat pagi! Monitoring pengumuman EPS-TOPIK & Training sudah aktif.\nAku akan kasih tahu kalau ada info baru ya! 😉",
+            parse_mode="Markdown",
+        )
+        logger.info("📢 Pesan pengingat jam 08:00 berhasil dikirim.")
+    except Exception as e:
+        logger.error(f"❌ Gagal kirim pesan jam 08:00: {e}")
 
-    if is_jam_delapan():
-        try:
-            await context.bot.send_message(
-                chat_id=CHAT_ID,
-                message_thread_id=THREAD_ID,
-                text="🕗 Selamat pagi! Monitoring pengumuman EPS-TOPIK & Training sudah aktif.\nAku akan kasih tahu kalau ada info baru ya! 😉",
-                parse_mode="Markdown",
-            )
-            logger.info("📢 Pesan pengingat jam 08:00 berhasil dikirim.")
-        except Exception as e:
-            logger.error(f"❌ Gagal kirim pesan jam 08:00: {e}")
-
-    # === Monitoring Pengumuman ===
-    pengumuman_baru = check_api_multi(
-        "https://www.kp2mi.go.id/gtog-data/korea/Pengumuman?start=0&length=10",
-        MONITOR_INFO,
-        "pengumuman",
-    )
-    for item in pengumuman_baru:
-        try:
-            pesan = format_pesan(item, tipe="pengumuman")
-            await context.bot.send_message(
-                chat_id=CHAT_ID,
-                message_thread_id=THREAD_ID,
-                text=pesan,
-                parse_mode="HTML",
-            )
-            logger.info("✅ Pengumuman baru berhasil dikirim.")
-            await asyncio.sleep(2)
-        except Exception as e:
-            logger.error(f"❌ Gagal kirim pengumuman: {e}")
-
-    # === Monitoring Preliminary Training ===
-    training_baru = check_api_multi(
-        "https://www.kp2mi.go.id/gtog-data/korea/Preliminary%20Training%20dan%20Info?start=0&length=10",
-        MONITOR_PRELIM,
-        "training",
-    )
-    for item in training_baru:
-        try:
-            pesan = format_pesan(item, tipe="training")
-            await context.bot.send_message(
-                chat_id=CHAT_ID,
-                message_thread_id=THREAD_ID,
-                text=pesan,
-                parse_mode="HTML",
+
+# ===== JOB Monitoring (interval adaptif, dijadwalkan ulang via run_once) =====
+async def monitor_job(context: ContextTypes.DEFAULT_TYPE):
+    item_baru = 0
+    aktif = is_waktu_aktif()
+    try:
+        if aktif:
+            item_baru = await jalankan_monitor(context)
+        else:
+            logger.info(
+                "⏹️ Lewat jam aktif, monitoring pengumuman & training dihentikan sementara."
             )
-            logger.info("✅ Info training baru berhasil dikirim.")
-            await asyncio.sleep(2)
-        except Exception as e:
-            logger.error(f"❌ Gagal kirim info training: {e}")
+    finally:
+        interval = poller.next_interval(item_baru, aktif)
+        logger.info(f"⏱️ Monitoring berikutnya dalam {interval:.0f} detik")
+        context.job_queue.run_once(monitor_job, interval, name="monitor")
+
+
+async def jalankan_monitor(context: ContextTypes.DEFAULT_TYPE) -> int:
+    """Satu siklus semua feed; mengembalikan jumlah item baru."""
+    item_baru = 0
+    # === Monitoring semua feed (paralel, request bersyarat) ===
+    for hasil in await run_cycle():
+        feed = FEEDS[hasil["key"]]
+        item_baru += len(hasil["items"])
+        if feed["kind"] == "kp2mi":
+            daftar = [format_pesan(item, tipe=feed["tipe"]) for item in hasil["items"]]
+        else:
+            daftar = [
+                "🆕 " + format_board_html(feed["board"], [item]).strip()
+                for item in hasil["items"]
+            ]
+        # Edit judul/link pengumuman lama (hanya jika MONITOR_ANNOUNCE_EDITS=1)
+        daftar += [
+            format_edit(baru, lama, tipe=feed["tipe"]) for baru, lama in hasil["edits"]
+        ]
+        for pesan in daftar:
+            try:
+                # Pacing & retry 429 ditangani antrean keluar (jalur info)
+                await outbound.send(
+                    context.bot.send_message,
+                    CHAT_ID,
+                    chat_id=CHAT_ID,
+                    lane=LANE_INFO,
+                    message_thread_id=THREAD_ID,
+                    text=pesan,
+                    parse_mode="HTML",
+                    disable_web_page_preview=feed["kind"] == "board",
+                )
+                logger.info(f"✅ Info {feed['tipe']} baru berhasil dikirim.")
+            except Exception as e:
+                logger.error(f"❌ Gagal kirim info {feed['tipe']}: {e}")
+    return item_baru
+
+
+# ===== JOB Refresh Snapshot EPS (/jadwal, /reg, /pass1, /pass2) =====
+# (papan juga disegarkan oleh monitor_job; job ini menjaga TTL saat di luar jam aktif)
+async def snapshot_job(context: ContextTypes.DEFAULT_TYPE):
+    await snapshots.refresh_due()
+
+
+# ===== JOB Mode raid: digest sambutan & ringkasan untuk admin =====
+async def raid_job(context: ContextTypes.DEFAULT_TYPE):
+    for chat_id, mentions in raid_detector.pop_digests():
+        outbound.submit(
+            context.bot.send_message,
+            chat_id,
+            format_digest(mentions),
+            chat_id=chat_id,
+            lane=LANE_BALASAN,
+            parse_mode="HTML",
+            disable_web_page_preview=True,
+        )
+    for chat_id, durasi, stats in raid_detector.pop_ended():
+        outbound.submit(
+            context.bot.send_message,
+            chat_id,
+            format_summary(durasi, stats),
+            chat_id=chat_id,
+            lane=LANE_BALASAN,
+            parse_mode="HTML",
+        )
+
+
+# ===== JOB Flush banned user & cache phishing (write-behind) =====
+async def persist_job(context: ContextTypes.DEFAULT_TYPE):
+    flush_all()
 
 
 # ===== Main Program =====
@@ -212,8 +208,42 @@ def main():
 
     # application.post_init = startup_notify
 
-    # === Jadwal monitoring tiap menit ===
-    application.job_queue.run_repeating(monitor_job, interval=60, first=5)
+    # === Chrome hangat di background + endpoint metrics lokal (METRICS_PORT) ===
+    async def startup_tasks(app):
+        app.create_task(browser_pool.warm())
+        await metrics.start_server()
+
+    application.post_init = startup_tasks
+
+    # === Tutup koneksi HTTP & browser, tulis data tertunda saat bot berhenti ===
+    async def shutdown_resources(app):
+        flush_all()
+        await outbound.close()
+        await close_client()
+        await browser_pool.close()
+        await metrics.stop_server()
+        stop_logging()
+
+    application.post_shutdown = shutdown_resources
+
+    # === Monitoring feed: interval adaptif, tiap siklus menjadwalkan berikutnya ===
+    application.job_queue.run_once(monitor_job, 5, name="monitor")
+
+    # === Sapaan pagi jam 08:00 (zona waktu server, sama dengan is_waktu_aktif) ===
+    application.job_queue.run_daily(
+        pagi_job, time=dtime(8, 0, tzinfo=datetime.now().astimezone().tzinfo)
+    )
+
+    # === Refresh snapshot scraper di background agar command dijawab dari memori ===
+    application.job_queue.run_repeating(snapshot_job, interval=120, first=15)
+
+    # === Digest sambutan & akhir mode raid ===
+    application.job_queue.run_repeating(raid_job, interval=15, first=15)
+
+    # === Tulis perubahan banned user & cache phishing secara berkala ===
+    application.job_queue.run_repeating(
+        persist_job, interval=FLUSH_INTERVAL, first=FLUSH_INTERVAL
+    )
 
     logger.info("✅ Azizah_Bot aktif dan siap digunakan.")
     application.run_polling()
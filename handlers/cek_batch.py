@@ -0,0 +1,179 @@
+import io
+import os
+import re
+import csv
+import asyncio
+import logging
+from html import escape
+from dotenv import load_dotenv
+from telegram import Update
+from telegram.ext import ContextTypes
+from utils.browser_pool import PoolBusy
+from utils.eps_lookup import lookup
+from handlers.cek_eps import eps_store, hitung_status_lulus
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+ADMIN_IDS = list(map(int, os.getenv("ADMIN_LIST", "").split(",")))
+OWNER_ID = int(os.getenv("MY_TELEGRAM_ID", "0"))
+
+MAX_BATCH = 200  # nomor per perintah
+BATCH_WORKERS = 4  # lookup upstream paralel
+MAX_FILE_SIZE = 64 * 1024
+MAX_TABLE_ROWS = 40  # sisanya hanya di CSV (batas 4096 karakter Telegram)
+NOMOR_RE = re.compile(r"\b[A-Z0-9]{16}\b")
+
+
+def ambil_nomor(teks: str) -> list:
+    """Nomor ujian unik (urutan dipertahankan) dari teks bebas."""
+    return list(dict.fromkeys(NOMOR_RE.findall(teks.upper())))
+
+
+async def baca_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+    """Gabungkan argumen, isi pesan, dan file .txt (dilampirkan/di-reply)."""
+    msg = update.message
+    bagian = [msg.text or msg.caption or ""]
+
+    dokumen = msg.document or (
+        msg.reply_to_message.document if msg.reply_to_message else None
+    )
+    if dokumen:
+        if dokumen.file_size and dokumen.file_size > MAX_FILE_SIZE:
+            raise ValueError("File terlalu besar (maks 64 KB).")
+        file = await dokumen.get_file()
+        isi = await file.download_as_bytearray()
+        bagian.append(bytes(isi).decode("utf-8", errors="ignore"))
+    elif msg.reply_to_message and msg.reply_to_message.text:
+        bagian.append(msg.reply_to_message.text)
+
+    return "\n".join(bagian)
+
+
+async def resolve_batch(nomor_list: list) -> dict:
+    """Cache hit langsung dari store; miss diambil paralel lewat worker pool."""
+    hasil = eps_store.get_many(nomor_list)
+    miss = [n for n in nomor_list if n not in hasil]
+    logger.info(f"📦 /cekbatch: {len(hasil)} cache hit, {len(miss)} miss")
+
+    sem = asyncio.Semaphore(BATCH_WORKERS)
+
+    async def worker(nomor):
+        async with sem:
+            try:
+                data = await lookup(nomor)
+            except PoolBusy:
+                return nomor, "sibuk"
+            except Exception:
+                logger.error(f"❌ /cekbatch gagal untuk {nomor}", exc_info=True)
+                return nomor, "error"
+            if data:
+                eps_store.put(nomor, data)
+            return nomor, data
+
+    for nomor, data in await asyncio.gather(*(worker(n) for n in miss)):
+        hasil[nomor] = data
+    return hasil
+
+
+def status_baris(data) -> str:
+    if data == "sibuk":
+        return "Sibuk, coba lagi"
+    if data == "error":
+        return "Gagal"
+    if not data:
+        return "Tidak ditemukan"
+    lulus = hitung_status_lulus(data["total"], data["lulus_min"]) == "✅ Ya"
+    return "Lulus" if lulus else "Tidak lulus"
+
+
+def buat_csv(nomor_list: list, hasil: dict) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(
+        [
+            "nomor_ujian",
+            "nama",
+            "tanggal",
+            "reading",
+            "listening",
+            "total",
+            "kkm",
+            "status",
+        ]
+    )
+    for nomor in nomor_list:
+        data = hasil.get(nomor)
+        d = data if isinstance(data, dict) else {}
+        writer.writerow(
+            [
+                nomor,
+                d.get("nama", ""),
+                d.get("tanggal", ""),
+                d.get("bacaan", ""),
+                d.get("mendengar", ""),
+                d.get("total", ""),
+                d.get("lulus_min", ""),
+                status_baris(data),
+            ]
+        )
+    # BOM agar Excel membaca UTF-8 dengan benar
+    return buf.getvalue().encode("utf-8-sig")
+
+
+def buat_tabel(nomor_list: list, hasil: dict) -> str:
+    baris = [f"{'Nomor':<16} {'Total':>5} {'KKM':>5}  Status"]
+    for nomor in nomor_list[:MAX_TABLE_ROWS]:
+        data = hasil.get(nomor)
+        d = data if isinstance(data, dict) else {}
+        total = d.get("total", "-")
+        kkm = d.get("lulus_min", "-")
+        baris.append(f"{nomor:<16} {total:>5} {kkm:>5}  {status_baris(data)}")
+    if len(nomor_list) > MAX_TABLE_ROWS:
+        baris.append(f"... +{len(nomor_list) - MAX_TABLE_ROWS} lainnya (lihat CSV)")
+    return "<pre>" + escape("\n".join(baris)) + "</pre>"
+
+
+async def cek_batch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/cekbatch <nomor...>, file .txt ber-caption /cekbatch, atau reply ke file."""
+    user_id = update.effective_user.id
+    if user_id != OWNER_ID and user_id not in ADMIN_IDS:
+        return await update.message.reply_text(
+            "⛔ Hanya admin yang bisa menggunakan perintah ini."
+        )
+
+    try:
+        nomor_list = ambil_nomor(await baca_input(update, context))
+    except ValueError as e:
+        return await update.message.reply_text(f"❌ {e}")
+
+    if not nomor_list:
+        return await update.message.reply_text(
+            "❗ Format: /cekbatch <nomor1> <nomor2> ...\n"
+            "atau reply file .txt berisi nomor ujian (16 karakter) dengan /cekbatch"
+        )
+    if len(nomor_list) > MAX_BATCH:
+        return await update.message.reply_text(
+            f"❗ Maksimal {MAX_BATCH} nomor per batch (diterima {len(nomor_list)})."
+        )
+
+    progress = await update.message.reply_text(
+        f"🔄 Mengecek {len(nomor_list)} nomor ujian..."
+    )
+    hasil = await resolve_batch(nomor_list)
+
+    ditemukan = sum(1 for n in nomor_list if isinstance(hasil.get(n), dict))
+    lulus = sum(1 for n in nomor_list if status_baris(hasil.get(n)) == "Lulus")
+    ringkasan = (
+        f"📋 <b>Hasil Batch EPS-TOPIK</b>\n"
+        f"Total: {len(nomor_list)} • Ditemukan: {ditemukan} • Lulus: {lulus}\n\n"
+    )
+
+    await progress.edit_text(
+        ringkasan + buat_tabel(nomor_list, hasil), parse_mode="HTML"
+    )
+    await update.message.reply_document(
+        document=buat_csv(nomor_list, hasil),
+        filename="hasil_eps_batch.csv",
+        caption="📎 Hasil lengkap dalam CSV",
+    )
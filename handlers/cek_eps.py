@@ -1,40 +1,27 @@
 # === IMPORT DAN KONFIGURASI DASAR ===
-import os
 import logging
-import json
+import math
 import re
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from telegram import Update
 from telegram.ext import ContextTypes
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-from utils.constants import EPS_DATA
+from utils.constants import EPS_DATA, EPS_DB
 from utils.topic_guard import handle_thread_guard
+from utils.browser_pool import PoolBusy
+from utils.eps_lookup import lookup
+from utils.kv_store import SqliteKV
+from utils.metrics import cache_lookup
+from utils.rate_limiter import rate_limiter
 
-CACHE_FILE = EPS_DATA
 logger = logging.getLogger(__name__)
 
 
-# === UTILITAS CACHE ===
-
-
-def load_cache():
-    """Membaca file cache hasil EPS jika tersedia."""
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-
-def save_cache(cache):
-    """Menyimpan hasil terbaru ke dalam file cache."""
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+# === PENYIMPANAN HASIL ===
+# Lookup per nomor ujian lewat primary key SQLite; data/cache_eps.json lama
+# diimpor sekali saat pertama kali store dibuka.
+eps_store = SqliteKV(EPS_DB, "hasil_eps")
+eps_store.migrate_json(EPS_DATA)
 
 
 # === FORMAT TANGGAL & MASA BERLAKU ===
@@ -154,72 +141,44 @@ async def cek_eps(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    cache = load_cache()
-    if nomor_ujian in cache:
-        data = cache[nomor_ujian]
+    data = eps_store.get(nomor_ujian)
+    cache_lookup("eps", "hit" if data else "miss")
+    if data:
         logger.info(f"✅ Ambil dari cache untuk {nomor_ujian}")
         result = tampilkan_hasil(data, "Tersimpan")
         await update.message.reply_text(result, parse_mode="Markdown")
         return
 
-    # Ambil dari web jika belum ada di cache
-    logger.info(f"🔍 Scraping hasil untuk: {nomor_ujian}")
-    try:
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get("https://www.eps.go.kr/eo/VisaFndRM.eo?langType=in")
-
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "sKorTestNo"))
+    # Ambil dari web jika belum ada di cache (baru di sini kena kuota kelas berat)
+    allowed, retry_after = rate_limiter.take_class("cek")
+    if not allowed:
+        logger.info(
+            f"⏳ /cek {nomor_ujian} ditahan (berat), tunggu {retry_after:.1f}s"
         )
-        input_box = driver.find_element(By.ID, "sKorTestNo")
-        input_box.clear()
-        input_box.send_keys(nomor_ujian)
+        await update.message.reply_text(
+            f"⏳ Bot sedang ramai, coba lagi dalam {math.ceil(retry_after)} detik."
+        )
+        return
 
-        tombol_view = driver.find_element(By.XPATH, "//button[contains(text(),'View')]")
-        tombol_view.click()
+    logger.info(f"🔍 Mengambil hasil untuk: {nomor_ujian}")
+    try:
+        data = await lookup(nomor_ujian)
 
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "tbl_typeA"))
-        )
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        driver.quit()
-        logger.info(f"✅ {nomor_ujian} Founded!")
-
-        table = soup.select_one(".tbl_typeA")
-        rows = table.find_all("tr")
-        cells = [
-            cell.get_text(strip=True) for row in rows for cell in row.find_all("td")
-        ]
-
-        logger.info(f"✅ {nomor_ujian} Proses Menyimpan........")
-        if len(cells) >= 12:
-            data = {
-                "nama": cells[5],
-                "negara": cells[1],
-                "bidang": cells[2],
-                "tanggal": cells[3],
-                "mendengar": cells[6],
-                "bacaan": cells[7],
-                "total": cells[8],
-                "lulus_min": cells[9],
-                "status": cells[10],
-                "masa": cells[11],
-            }
+        if data:
+            logger.info(f"✅ {nomor_ujian} Founded! Proses Menyimpan........")
             result = tampilkan_hasil(data)
-            cache[nomor_ujian] = data
-            save_cache(cache)
-            logger.info(f"✅ {nomor_ujian} Disimpan di JSON.")
+            eps_store.put(nomor_ujian, data)
+            logger.info(f"✅ {nomor_ujian} Disimpan di store.")
         else:
             result = "❌ Data tidak ditemukan atau belum diumumkan."
 
         await update.message.reply_text(result, parse_mode="Markdown")
 
+    except PoolBusy:
+        logger.warning(f"⏳ Antrian browser penuh, /cek {nomor_ujian} ditolak.")
+        await update.message.reply_text(
+            "⏳ Server sedang sibuk memproses pengecekan lain. Coba lagi sebentar lagi."
+        )
     except Exception as e:
         logger.error(f"❌ Gagal scraping EPS: {e}", exc_info=True)
         await update.message.reply_text("❌ Terjadi kesalahan saat mengambil hasil.")
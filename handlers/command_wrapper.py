@@ -1,34 +1,87 @@
+import math
 import time
-import asyncio
+import logging
 from telegram import Update
 from telegram.ext import ContextTypes
+from utils.rate_limiter import rate_limiter
+from utils.metrics import HANDLER_SECONDS, HANDLER_ERRORS
 
-COOLDOWN_COMMAND = 10  # detik
-_last_command_time = 0  # global shared cooldown
+logger = logging.getLogger(__name__)
 
+NOTICE_TTL = 10  # detik sebelum pesan ⏳ dihapus
+_last_notice = {}  # user_id → waktu notifikasi ⏳ terakhir (anti spam notifikasi)
+
+
+async def _hapus_pesan(context: ContextTypes.DEFAULT_TYPE):
+    chat_id, message_id = context.job.data
+    try:
+        await context.bot.delete_message(chat_id, message_id)
+    except Exception:
+        pass
+
+
+def with_metrics(name: str, callback):
+    """Catat latensi (histogram) dan exception tak tertangani per handler."""
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        mulai = time.perf_counter()
+        try:
+            return await callback(update, context)
+        except Exception:
+            HANDLER_ERRORS.inc(name)
+            raise
+        finally:
+            HANDLER_SECONDS.observe(time.perf_counter() - mulai, name)
+
+    return wrapper
+
+
+def with_rate_limit(command: str, callback):
+    """Bungkus handler command dengan token bucket per user/chat/kelas command."""
 
-def with_cooldown(callback):
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        global _last_command_time
+        user = update.effective_user
+        chat = update.effective_chat
+        allowed, retry_after, scope = rate_limiter.check(user.id, chat.id, command)
+
+        if allowed:
+            return await callback(update, context)
+
+        logger.info(
+            f"⏳ /{command} dari {user.id} ditahan ({scope}), tunggu {retry_after:.1f}s"
+        )
 
-        now = time.time()
-        if now - _last_command_time < COOLDOWN_COMMAND:
-            msg = await update.message.reply_text(
-                "⏳ Tunggu sebentar sebelum menggunakan perintah lagi."
-            )
+        # Sudah diberi tahu barusan → cukup hapus command-nya
+        now = time.monotonic()
+        if now - _last_notice.get(user.id, 0) < NOTICE_TTL:
             try:
                 await update.message.delete()
-            except:
-                pass
-            # Jadwalkan penghapusan pesan ⏳ setelah cooldown selesai
-            await asyncio.sleep(COOLDOWN_COMMAND)
-            try:
-                await msg.delete()
-            except:
+            except Exception:
                 pass
             return
+        _last_notice[user.id] = now
+        if len(_last_notice) > 1000:
+            for uid, t in list(_last_notice.items()):
+                if now - t >= NOTICE_TTL:
+                    del _last_notice[uid]
+
+        if scope == "user":
+            detik = math.ceil(retry_after)
+            teks = f"⏳ Tunggu {detik} detik sebelum menggunakan perintah lagi."
+        else:
+            teks = "⏳ Bot sedang ramai, coba lagi sebentar lagi."
+        try:
+            msg = await update.message.reply_text(teks)
+        except Exception:
+            return
+        try:
+            await update.message.delete()
+        except Exception:
+            pass
 
-        _last_command_time = now
-        await callback(update, context)
+        # Hapus lewat job queue, bukan coroutine yang tidur menunggu
+        context.job_queue.run_once(
+            _hapus_pesan, NOTICE_TTL, data=(chat.id, msg.message_id)
+        )
 
     return wrapper
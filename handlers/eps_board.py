@@ -0,0 +1,73 @@
+import logging
+from html import escape
+from telegram import Update
+from telegram.ext import ContextTypes
+from utils.eps_boards import BOARDS
+from utils.eps_scraper import get_board
+from utils.topic_guard import handle_thread_guard
+
+logger = logging.getLogger(__name__)
+
+
+def format_board_html(key: str, data: list, jumlah: int = 1) -> str:
+    board = BOARDS[key]
+    output = []
+    jumlah = max(1, min(jumlah, 10))
+
+    for i, item in enumerate(data[:jumlah], 1):
+        bagian = f"<b>{i}. {board['heading']}</b>\n\n"
+        for label, field in board["fields"]:
+            bagian += f"<b>{label}:</b> {escape(item.get(field, '-'))}\n"
+        bagian += f'<a href="{board["url"]}">🔗 Selengkapnya (klik di sini)</a>\n\n'
+        output.append(bagian)
+
+    return "".join(output)
+
+
+def board_handler(key: str):
+    """Buat handler command (/pass1, /pass2, /jadwal, /reg, ...) untuk satu papan."""
+    board = BOARDS[key]
+
+    async def handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not await handle_thread_guard(board["guard_key"], update, context):
+            return
+        try:
+            jumlah = 1
+            if context.args:
+                try:
+                    jumlah = int(context.args[0])
+                    if not (1 <= jumlah <= 10):
+                        await update.message.reply_text(
+                            "❗ Masukkan angka antara 1–10."
+                        )
+                        return
+                except ValueError:
+                    await update.message.reply_text(
+                        f"❗ Format salah. Contoh: /{board['command']} 3"
+                    )
+                    return
+
+            data = await get_board(key)
+
+            if not data:
+                await update.message.reply_text(
+                    f"⚠️ Tidak ada data {board['label']} ditemukan."
+                )
+                return
+
+            pesan = format_board_html(key, data, jumlah)
+            await update.message.reply_text(
+                pesan.strip(), parse_mode="HTML", disable_web_page_preview=True
+            )
+
+        except Exception:
+            logger.error(f"❌ Gagal ambil data {board['label']}", exc_info=True)
+            await update.message.reply_text(
+                board.get(
+                    "error_text",
+                    f"❌ Terjadi kesalahan saat mengambil data {board['label']}.",
+                )
+            )
+
+    handler.__name__ = f"get_{board['command']}"
+    return handler
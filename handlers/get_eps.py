@@ -5,13 +5,12 @@ import re
 from dotenv import load_dotenv
 from telegram import Update
 from telegram.ext import ContextTypes
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import UnexpectedAlertPresentException
 from utils.constants import EPS_PROGRESS
+from utils.browser_pool import browser_pool, PoolBusy
 from bs4 import BeautifulSoup
 
 load_dotenv()
@@ -26,15 +25,6 @@ PROGRESS_URL = (
 )
 
 
-def setup_driver():
-    options = Options()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--headless=new")
-    return webdriver.Chrome(options=options)
-
-
 def login(driver):
     driver.get(LOGIN_URL)
     try:
@@ -272,6 +262,15 @@ def format_data(data: dict) -> str:
     return "\n".join(lines)
 
 
+def ambil_progress(driver):
+    """Login → verifikasi tanggal lahir → baca progres (di worker thread pool)."""
+    if not login(driver):
+        return "login_gagal", None
+    if not verifikasi_tanggal_lahir(driver, BIRTHDAY):
+        return "verifikasi_gagal", None
+    return "ok", akses_progress(driver)
+
+
 async def cek_kolom(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger = logging.getLogger(__name__)
     logger.info(f"🟢 Handler /cek_kolom dipanggil oleh user {update.effective_user.id}")
@@ -283,21 +282,21 @@ async def cek_kolom(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "❌ Perintah ini hanya tersedia untuk pengguna terdaftar di pesan pribadi."
         )
 
-    driver = setup_driver()
     try:
-        if not login(driver):
+        status, data = await browser_pool.run(ambil_progress)
+
+        if status == "login_gagal":
             logger.warning("🔒 Gagal login ke EPS")
             return await context.bot.send_message(
                 chat_id=user_id, text="❌ Gagal login ke EPS."
             )
 
-        if not verifikasi_tanggal_lahir(driver, BIRTHDAY):
+        if status == "verifikasi_gagal":
             logger.warning("📛 Gagal verifikasi tanggal lahir")
             return await context.bot.send_message(
                 chat_id=user_id, text="❌ Verifikasi tanggal lahir gagal."
             )
 
-        data = akses_progress(driver)
         logger.info("✅ Data berhasil diambil dari EPS.go.kr")
 
         if data:
@@ -333,10 +332,12 @@ async def cek_kolom(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await context.bot.send_message(chat_id=user_id, text=msg, parse_mode="HTML")
             logger.info("📤 Data progres EPS dikirim ke user.")
 
+    except PoolBusy:
+        await context.bot.send_message(
+            chat_id=user_id, text="⏳ Browser sedang sibuk, coba lagi sebentar lagi."
+        )
     except Exception as e:
         await context.bot.send_message(
             chat_id=user_id, text="❌ Terjadi kesalahan saat scraping."
         )
         logging.exception("Scraping error:")
-    finally:
-        driver.quit()
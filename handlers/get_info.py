@@ -1,75 +1,28 @@
 import logging
-import os
-import json
-import requests
-from bs4 import BeautifulSoup
-from html import unescape
 from telegram import Update
 from telegram.ext import ContextTypes
-from utils.constants import PENGUMUMAN_FILE
 from utils.topic_guard import handle_thread_guard
+from utils.feed_records import RECORDS
+from utils.http_client import fetch_json
+from utils.singleflight import single_flight
 
 
 logger = logging.getLogger(__name__)
 
 API_URL = "https://www.kp2mi.go.id/gtog-data/korea/Pengumuman?draw=1&start=0&length=10"
-CACHE_FILE = PENGUMUMAN_FILE
 
 
-# === Parser judul & link ===
-def parse_judul_link(html_string):
-    if not html_string or not isinstance(html_string, str):
-        return "Judul tidak ditemukan", "-"
+# === Fetch + diff per record (satu kali untuk semua pemanggil serentak) ===
+async def perbarui_info():
+    payload = await fetch_json(API_URL)
+    api_data = payload.get("data", [])
 
-    raw_html = unescape(html_string)
-    soup = BeautifulSoup(raw_html, "html.parser")
-    a = soup.find("a")
-    if not a or not a.get("href"):
+    if not api_data:
+        logger.warning("API tidak mengembalikan data.")
+        return []
 
-        return "Judul tidak ditemukan", "-"
-    teks = a.get_text(strip=True)
-    href = a["href"].replace("\\/", "/").strip()
-    if href.startswith("/"):
-        href = f"https://www.kp2mi.go.id{href}"
-    return teks, href
-
-
-# === Cache ===
-def load_cache_info():
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
-
-
-def save_cache_info(api_data):
-    cleaned = []
-    for item in api_data:
-        html_judul = item.get("judul", "")
-        judul, link = parse_judul_link(html_judul)
-
-        if judul == "Judul tidak ditemukan" or link == "-":
-
-            continue
-
-        cleaned.append(
-            {
-                "id": item.get("id"),
-                "judul": judul,
-                "link": link,
-                "creator": item.get("creator", "-"),
-                "is_active": item.get("is_active", 1),
-                "created_at": item.get("created_at", "-"),
-                "updated_at": item.get("updated_at", "-"),
-                "view": item.get("view", 0),
-                "kategori": item.get("kategori", "-"),
-                "tanggal": item.get("tanggal", "-"),
-            }
-        )
-
-    if cleaned:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cleaned, f, ensure_ascii=False, indent=2)
+    # Hanya record yang berubah yang disimpan; view saja tidak menulis ulang JSON
+    return RECORDS["pengumuman"].sync(api_data).rows
 
 
 # === Handler ===
@@ -88,38 +41,12 @@ async def get_info(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 await update.message.reply_text("Format salah. Contoh: /get 3")
                 return
 
-        response = requests.get(API_URL)
-        api_data = response.json().get("data", [])
+        data = (await single_flight(API_URL, perbarui_info))[:jumlah]
 
-        if not api_data:
-            logger.warning("API tidak mengembalikan data.")
+        if not data:
             await update.message.reply_text("⚠️ Tidak ada pengumuman ditemukan.")
             return
 
-        cache_data = load_cache_info()
-        id_terakhir_cache = cache_data[0]["id"] if cache_data else None
-        id_terbaru_api = api_data[0].get("id")
-
-        if id_terakhir_cache != id_terbaru_api:
-            logger.info("📥 Ditemukan pengumuman baru, update cache.")
-            save_cache_info(api_data)
-            data = load_cache_info()[:jumlah]
-        else:
-            logger.info("🟡 Tidak ada pengumuman baru — gunakan cache (update view)")
-            save_cache_info(api_data)
-            logger.info(
-                "ℹ️ Cache diperbarui untuk menyinkronkan view atau data lainnya."
-            )
-            updated_cache = []
-            for i, cached_item in enumerate(cache_data):
-                if i < len(api_data):
-                    cached_item["view"] = api_data[i].get(
-                        "view", cached_item.get("view")
-                    )
-                updated_cache.append(cached_item)
-            save_cache_info(updated_cache)
-            data = updated_cache[:jumlah]
-
         pesan = ""
         for idx, item in enumerate(data, start=1):
             judul = item.get("judul", "-")
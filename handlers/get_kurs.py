@@ -1,19 +1,19 @@
-import requests
 import logging
 from telegram import Update
 from telegram.ext import ContextTypes
+from utils.http_client import fetch_json
+from utils.singleflight import single_flight
 
 logger = logging.getLogger(__name__)
 
 
-def get_rate(base: str, target: str):
+async def get_rate(base: str, target: str):
     try:
         logger.info(
             f"[🔄 FETCH] Mengambil kurs dari {base.upper()} ke {target.upper()}"
         )
         url = f"https://www.floatrates.com/daily/{base.lower()}.json"
-        resp = requests.get(url, timeout=5)
-        data = resp.json()
+        data = await single_flight(url, lambda: fetch_json(url, timeout=5))
         rate = data[target.lower()]["rate"]
         logger.info(f"[✅ RATE] 1 {base.upper()} = {rate:.4f} {target.upper()}")
         return rate
@@ -33,7 +33,7 @@ async def kurs_default(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
 
     waiting_msg = await update.message.reply_text("🔄 Mohon tunggu, mengambil kurs...")
 
-    rate = get_rate("krw", "idr")
+    rate = await get_rate("krw", "idr")
     if rate:
         await waiting_msg.delete()
         logger.info(f"[✅ RESP] Berhasil mengirim kurs ke {user.id}")
@@ -61,7 +61,7 @@ async def kurs_idr(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
 
     waiting_msg = await update.message.reply_text("🔄 Mohon tunggu, menghitung...")
 
-    rate = get_rate("krw", "idr")
+    rate = await get_rate("krw", "idr")
     if rate:
         hasil = amt * rate
         await waiting_msg.delete()
@@ -90,7 +90,7 @@ async def kurs_won(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
 
     waiting_msg = await update.message.reply_text("🔄 Mohon tunggu, menghitung...")
 
-    rate = get_rate("idr", "krw")
+    rate = await get_rate("idr", "krw")
     if rate:
         hasil = amt * rate
         await waiting_msg.delete()
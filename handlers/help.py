@@ -41,6 +41,7 @@ Contoh: `/tanya Siapa presiden Korea?`
 /ban (reply) – Ban pengguna  
 /unban (reply) – Unban pengguna  
 /restrike (reply) – Reset strike user  
+/cekbatch [nomor...] – Cek banyak nomor ujian sekaligus (atau kirim file .txt)  
 
 🛡️ Owner Saja:  
 /resetstrikeall – Reset semua strike  
@@ -1,38 +1,30 @@
-import re
 import os
 import time
 import json
-import random
 import logging
-from collections import defaultdict
 from telegram import Update, ChatPermissions, User
 from telegram.ext import ContextTypes
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
-from utils.constants import MODERATION_FILE, BANNED_FILE, RESPON_FILE, STRIKE_LOG
-from utils.anti_phishing import handle_phishing
-
-
-# Waktu reset per strike
-STRIKE_RESET_RULES = {
-    1: timedelta(days=1),
-    2: timedelta(days=2),
-}
-
-# Untuk mencatat waktu strike
-user_strike_timestamps = defaultdict(list)
+from html import escape
+from datetime import datetime
+from utils.constants import MODERATION_FILE
+from utils.anti_phishing import (
+    cari_link_mencurigakan,
+    extract_links,
+    might_have_link,
+    tindak_phishing,
+)
+from utils.persistence import banned_users
+from utils.raid_detector import raid_detector
+from utils.moderation_tokenizer import ModerationMatcher
+from utils.message_pipeline import MessagePipeline, Stage
+from utils.strike_tracker import strikes, format_history
+from handlers.responder import perlu_balas, balas
 
-os.makedirs("logs", exist_ok=True)
 os.makedirs("data", exist_ok=True)
 
-
-# === Logging ===
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filename="logs/moderasi.log",
-    filemode="a",
-)
+# Catatan strike → logs/strike.log (handler dipasang oleh setup_logging)
+strike_logger = logging.getLogger("strike")
 
 
 def load_keywords():
@@ -83,29 +75,16 @@ MUTE_DURATION = 60 * 5  # 5 menit
 
 BAN_KEYWORDS, BAD_WORDS, SENSITIF = load_keywords()
 
-# === Data Tracking ===
-user_strikes = defaultdict(int)
-last_global_command = 0
-
-# === Load respon.json ===
-try:
-    with open(RESPON_FILE, "r", encoding="utf-8") as f:
-        RESPON_DATA = json.load(f)
-except:
-    RESPON_DATA = []
-
-# === Banned User Storage ===
-try:
-    with open(BANNED_FILE, "r") as f:
-        BANNED_USERS = set(json.load(f))
-except:
-    BANNED_USERS = set()
 
+def build_matcher():
+    return ModerationMatcher(
+        {"BAN": BAN_KEYWORDS, "BAD": BAD_WORDS, "SENSITIF": SENSITIF}
+    )
 
-def save_banned():
-    with open(BANNED_FILE, "w") as f:
-        json.dump(list(BANNED_USERS), f)
 
+# Automaton dibangun sekali; /tambahkata membangun ulang lalu menukar referensi
+KEYWORD_MATCHER = build_matcher()
+LINK_MARKERS = ("http", ".com", "t.me/")
 
 def is_admin(user_id: int) -> bool:
     return user_id in ADMIN_IDS
@@ -117,10 +96,6 @@ def get_target_user(update: Update) -> User | None:
     return None
 
 
-def clean_text(text: str) -> str:
-    return re.sub(r"[^\w\s]", "", text.lower())
-
-
 async def cmd_tambahkata(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     if not is_admin(update.effective_user.id):
         return await update.message.reply_text(
@@ -135,7 +110,7 @@ async def cmd_tambahkata(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     kategori = ctx.args[0].upper()
     kata_baru = ctx.args[1].lower()
 
-    global BAN_KEYWORDS, BAD_WORDS, SENSITIF
+    global BAN_KEYWORDS, BAD_WORDS, SENSITIF, KEYWORD_MATCHER
 
     added = False
     label = ""
@@ -162,6 +137,7 @@ async def cmd_tambahkata(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
 
     if added:
         save_keywords(BAN_KEYWORDS, BAD_WORDS, SENSITIF)
+        KEYWORD_MATCHER = build_matcher()
 
         try:
             await update.message.delete()
@@ -179,16 +155,21 @@ async def cmd_tambahkata(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
 # === Mute & Ban ===
 async def mute_user(chat_id, user_id, ctx, duration=MUTE_DURATION):
     until = int(time.time() + duration)
-    await ctx.bot.restrict_chat_member(
-        chat_id, user_id, ChatPermissions(can_send_messages=False), until_date=until
+    await raid_detector.run(
+        chat_id,
+        "mute",
+        ctx.bot.restrict_chat_member,
+        chat_id,
+        user_id,
+        ChatPermissions(can_send_messages=False),
+        until_date=until,
     )
     logging.info(f"🔇 Mute {user_id} di {chat_id} selama {duration}s")
 
 
 async def ban_user(chat_id, user_id, ctx):
-    await ctx.bot.ban_chat_member(chat_id, user_id)
-    BANNED_USERS.add(user_id)
-    save_banned()
+    await raid_detector.run(chat_id, "ban", ctx.bot.ban_chat_member, chat_id, user_id)
+    banned_users.add(user_id)
     logging.warning(f"🚫 Ban {user_id} dari {chat_id}")
 
 
@@ -288,8 +269,7 @@ async def cmd_unban(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
         )
 
     await ctx.bot.unban_chat_member(update.effective_chat.id, target.id)
-    BANNED_USERS.discard(target.id)
-    save_banned()
+    banned_users.discard(target.id)
     await update.message.reply_text(
         f"✅ {target.mention_html()} telah di-unban.", parse_mode="HTML"
     )
@@ -312,7 +292,7 @@ async def cmd_restrike(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
             "ℹ️ Balas pesan pengguna yang ingin direset strikenya."
         )
 
-    user_strikes[target.id] = 0
+    strikes.reset(target.id, oleh=f"admin {update.effective_user.id}")
     await update.message.reply_text(
         f"✅ Strike {target.mention_html()} telah direset.", parse_mode="HTML"
     )
@@ -341,11 +321,16 @@ async def cmd_cekstrike(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     if is_admin(target.id):
         return await update.message.reply_text("🛡 Admin tidak dikenai sistem strike.")
 
-    count = user_strikes.get(uid, 0)
-    await update.message.reply_text(
-        f"📊 Strike {target.mention_html()}: {count}/{STRIKE_LIMIT}",
-        parse_mode="HTML",
-    )
+    count = strikes.count(uid)
+    pesan = f"📊 Strike {target.mention_html()}: {count}/{STRIKE_LIMIT}"
+    berakhir = strikes.next_expiry(uid)
+    if berakhir:
+        waktu = datetime.fromtimestamp(berakhir).strftime("%d/%m %H:%M")
+        pesan += f"\n⌛ Strike terlama berakhir {waktu}"
+    riwayat = strikes.history(uid)
+    if riwayat:
+        pesan += f"\n\n🗒️ Riwayat:\n{escape(format_history(riwayat))}"
+    await update.message.reply_text(pesan, parse_mode="HTML")
 
 
 async def cmd_resetstrikeall(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
@@ -354,11 +339,10 @@ async def cmd_resetstrikeall(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
             "🚫 Perintah ini hanya untuk pemilik bot."
         )
 
-    user_strikes.clear()
-    user_strike_timestamps.clear()
+    strikes.reset_all()
+    strikes.flush()
 
-    with open(STRIKE_LOG, "a") as f:
-        f.write(f"{datetime.utcnow().isoformat()} - Semua strike direset oleh OWNER\n")
+    strike_logger.info("Semua strike direset oleh OWNER")
 
     await update.message.reply_text("✅ Semua strike berhasil direset.")
 
@@ -369,9 +353,9 @@ async def cmd_resetbanall(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
             "🚫 Perintah ini hanya untuk pemilik bot."
         )
 
-    # Untuk jaga-jaga, reset file JSON dan data set
-    BANNED_USERS.clear()
-    save_banned()
+    # Perintah owner yang jarang → langsung tulis, tidak menunggu job flush
+    banned_users.clear()
+    banned_users.flush()
 
     await update.message.reply_text(
         "✅ Semua user yang dibanned telah dihapus dari daftar ban."
@@ -389,94 +373,138 @@ async def lihat_admin(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(msg, parse_mode="Markdown")
 
 
-# === Handler Utama ===
-async def moderasi(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    # 1. 🔍 Deteksi phishing dulu
-    if await handle_phishing(update, ctx):
-        return
-    global last_global_command
+# === Tahap pipeline pesan (urutan = urutan di PIPELINE) ===
+# deteksi_*: sinkron, diukur sebagai waktu CPU tahap; aksi_*: await ke Telegram
+def deteksi_raid(view, ctx):
+    raid_detector.record_message(view.chat_id)
+    return None
 
-    msg = update.message
-    if not msg or not msg.text:
-        return
 
-    text = msg.text
-    user_id = msg.from_user.id
-    chat_id = msg.chat_id
-    is_bot = msg.from_user.is_bot
+async def aksi_banned(view, update, ctx, hasil):
+    try:
+        await raid_detector.run(view.chat_id, "hapus", view.msg.delete)
+    except:
+        pass
+    return True
 
-    if user_id in BANNED_USERS:
-        try:
-            await msg.delete()
-        except:
-            pass
-        return
-
-    # Auto reset strike jika waktunya sudah lewat
-    timestamps = user_strike_timestamps.get(user_id, [])
-    if timestamps:
-        now = datetime.utcnow()
-        retained = []
-        for i, t in enumerate(timestamps):
-            try:
-                ts = datetime.fromisoformat(t)
-                reset_time = STRIKE_RESET_RULES.get(i + 1)
-                if reset_time and now - ts < reset_time:
-                    retained.append(t)
-            except:
-                continue
-        user_strike_timestamps[user_id] = retained
-        user_strikes[user_id] = len(retained)
-
-    # Deteksi kata kasar, topik sensitif, link
-    clean = clean_text(text)
-
-    # Link + kata terlarang → ban
-    if any(link in clean for link in ["http", ".com", "t.me/"]):
-        if any(bad in clean for bad in BAN_KEYWORDS):
-            await msg.delete()
-            await ban_user(chat_id, user_id, ctx)
-            return
+
+def _links(view) -> list:
+    return extract_links(view.text)
+
+
+def deteksi_phishing(view, ctx):
+    links = view.memo("links", _links)
+    if not links:
+        return None
+    return cari_link_mencurigakan(links, ctx.bot.username)
+
+
+async def aksi_phishing(view, update, ctx, link):
+    await tindak_phishing(update, ctx, link)
+    return True
+
+
+def deteksi_kata(view, ctx):
+    # Kata kasar, topik sensitif, link (per token utuh, tahan leet/homoglyph)
+    hits = KEYWORD_MATCHER.find_normalized(view.normalized)
+    if not hits:
+        return None
+    # Link + kata terlarang → ban (penanda link dicek di teks asli)
+    if "BAN" in hits and not any(link in view.lower for link in LINK_MARKERS):
+        hits.discard("BAN")
+    return hits
+
+
+async def aksi_kata(view, update, ctx, hits):
+    msg = view.msg
+    text = view.text
+    user_id = view.user_id
+    chat_id = view.chat_id
+
+    if "BAN" in hits:
+        await raid_detector.run(chat_id, "hapus", msg.delete)
+        await ban_user(chat_id, user_id, ctx)
+        return True
 
     # Kata kasar → strike / mute / ban
-    if any(bad in clean for bad in BAD_WORDS):
-        await msg.delete()
-        now = datetime.utcnow()
-        user_strikes[user_id] += 1
-        strikes = user_strikes[user_id]
-        user_strike_timestamps[user_id].append(now.isoformat())
-
-        with open(STRIKE_LOG, "a") as f:
-            f.write(
-                f"{now.isoformat()} - User {user_id} dapat strike ke-{strikes}: {text}\n"
-            )
+    if "BAD" in hits:
+        await raid_detector.run(chat_id, "hapus", msg.delete)
+        jumlah = strikes.add(user_id, "kata kasar")
+        strike_logger.info(
+            f"User {user_id} dapat strike ke-{jumlah}: {text}",
+            extra={"data": {"user_id": user_id, "chat_id": chat_id, "strike": jumlah}},
+        )
 
-        if strikes >= STRIKE_LIMIT:
+        if jumlah >= STRIKE_LIMIT:
             await ban_user(chat_id, user_id, ctx)
-            await ctx.bot.send_message(
+            await raid_detector.run(
+                chat_id,
+                "notice",
+                ctx.bot.send_message,
                 chat_id,
                 f"🚫 {msg.from_user.mention_html()} dibanned karena terlalu banyak pelanggaran.",
                 parse_mode="HTML",
             )
         else:
             await mute_user(chat_id, user_id, ctx)
-            await ctx.bot.send_message(
+            await raid_detector.run(
                 chat_id,
-                f"⚠️ {msg.from_user.mention_html()} strike {strikes}/{STRIKE_LIMIT}. Dimute sementara.",
+                "notice",
+                ctx.bot.send_message,
+                chat_id,
+                f"⚠️ {msg.from_user.mention_html()} strike {jumlah}/{STRIKE_LIMIT}. Dimute sementara.",
                 parse_mode="HTML",
             )
-        return
+        return True
 
     # Topik sensitif
-    if any(topik in clean for topik in SENSITIF):
+    if "SENSITIF" in hits:
         await mute_user(chat_id, user_id, ctx)
-        await ctx.bot.send_message(
+        await raid_detector.run(
+            chat_id,
+            "notice",
+            ctx.bot.send_message,
             chat_id,
             f"⚠️ {msg.from_user.first_name}, topik sensitif (politik/agama/ras) dilarang.",
             parse_mode="HTML",
         )
-        return
+        return True
+    return False
+
+
+def deteksi_responder(view, ctx):
+    return perlu_balas(view.msg, view.lower, ctx.bot.username)
+
+
+async def aksi_responder(view, update, ctx, hasil):
+    await balas(view.msg, view.lower)
+    return True
+
+
+PIPELINE = MessagePipeline(
+    [
+        Stage("raid", deteksi_raid),
+        Stage(
+            "banned", act=aksi_banned, prefilter=lambda v: v.user_id in banned_users
+        ),
+        Stage(
+            "phishing",
+            deteksi_phishing,
+            aksi_phishing,
+            prefilter=lambda v: might_have_link(v.lower),
+        ),
+        Stage("kata", deteksi_kata, aksi_kata),
+        # Balasan bot paling akhir: hanya untuk pesan yang lolos moderasi
+        Stage(
+            "responder",
+            deteksi_responder,
+            aksi_responder,
+            prefilter=lambda v: v.is_reply_to_bot or "@" in v.text,
+        ),
+    ]
+)
+
 
-    # Balasan ke bot → random response
-    if msg.reply_to_message and msg.reply_to_message.from_user.is_bot and RESPON_DATA:
-        await msg.reply_text(random.choice(RESPON_DATA))
+# === Handler Utama ===
+async def moderasi(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    await PIPELINE.run(update, ctx)
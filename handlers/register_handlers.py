@@ -1,19 +1,19 @@
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 from handlers import help, cek_eps, welcome, moderasi
-from handlers.command_wrapper import with_cooldown
+from handlers.command_wrapper import with_metrics, with_rate_limit
 from handlers.get_info import get_info
 from handlers.get_prelim import get_prelim
 from handlers.responder import simple_responder
 from handlers.get_eps import cek_kolom
+from handlers.cek_batch import cek_batch
 from handlers.tanya_meta import tanya_meta
 from handlers.get_link import link_command
 from handlers.get_kurs import kurs_default, kurs_idr, kurs_won
 from handlers.rules import show_rules
 from handlers.welcome import welcome_new_member
-from handlers.get_reg import get_reg
-from handlers.get_jadwal import get_jadwal
-from handlers.get_pass1 import get_pass1
-from handlers.get_pass2 import get_pass2
+from handlers.eps_board import board_handler
+from handlers.stats import cmd_stats
+from utils.eps_boards import BOARDS
 from handlers.moderasi import (
     lihat_admin,
     moderasi,
@@ -31,41 +31,70 @@ from handlers.moderasi import (
 
 def register_handlers(app: Application):
     # === Command Handlers ===
-    app.add_handler(CommandHandler("help", with_cooldown(help.help_command)))
-    app.add_handler(CommandHandler("cek", with_cooldown(cek_eps.cek_eps)))
-    app.add_handler(CommandHandler("get", with_cooldown(get_info)))
-    app.add_handler(CommandHandler("prelim", with_cooldown(get_prelim)))
-    app.add_handler(CommandHandler("reg", with_cooldown(get_reg)))
-    app.add_handler(CommandHandler("jadwal", with_cooldown(get_jadwal)))
-    app.add_handler(CommandHandler("pass1", with_cooldown(get_pass1)))
-    app.add_handler(CommandHandler("pass2", with_cooldown(get_pass2)))
-    app.add_handler(CommandHandler("link", with_cooldown(link_command)))
-    app.add_handler(CommandHandler("cek_eps", with_cooldown(cek_kolom)))
-    app.add_handler(CommandHandler("tanya", with_cooldown(tanya_meta)))
-    app.add_handler(CommandHandler("kurs", with_cooldown(kurs_default)))
-    app.add_handler(CommandHandler("kursidr", with_cooldown(kurs_idr)))
-    app.add_handler(CommandHandler("kurswon", with_cooldown(kurs_won)))
-    app.add_handler(CommandHandler("rules", with_cooldown(show_rules)))
-    app.add_handler(CommandHandler("ban", with_cooldown(cmd_ban)))
-    app.add_handler(CommandHandler("unban", with_cooldown(cmd_unban)))
-    app.add_handler(CommandHandler("mute", with_cooldown(cmd_mute)))
-    app.add_handler(CommandHandler("unmute", with_cooldown(cmd_unmute)))
-    app.add_handler(CommandHandler("restrike", with_cooldown(cmd_restrike)))
-    app.add_handler(CommandHandler("adminlist", with_cooldown(lihat_admin)))
-    app.add_handler(CommandHandler("tambahkata", cmd_tambahkata))
-    app.add_handler(CommandHandler("cekstrike", cmd_cekstrike))
-    app.add_handler(CommandHandler("resetstrikeall", cmd_resetstrikeall))
-    app.add_handler(CommandHandler("resetbanall", cmd_resetbanall))
+    # Command umum lewat token bucket (per user, per chat, per kelas command)
+    rate_limited = [
+        ("help", help.help_command),
+        ("cek", cek_eps.cek_eps),
+        ("get", get_info),
+        ("prelim", get_prelim),
+        *((board["command"], board_handler(key)) for key, board in BOARDS.items()),
+        ("link", link_command),
+        ("cek_eps", cek_kolom),
+        ("tanya", tanya_meta),
+        ("kurs", kurs_default),
+        ("kursidr", kurs_idr),
+        ("kurswon", kurs_won),
+        ("rules", show_rules),
+        ("ban", cmd_ban),
+        ("unban", cmd_unban),
+        ("mute", cmd_mute),
+        ("unmute", cmd_unmute),
+        ("restrike", cmd_restrike),
+        ("adminlist", lihat_admin),
+    ]
+    # Semua handler dibungkus with_metrics (latensi & error per nama, lihat /stats)
+    for name, callback in rate_limited:
+        app.add_handler(
+            CommandHandler(name, with_metrics(name, with_rate_limit(name, callback)))
+        )
+
+    owner_admin = [
+        ("tambahkata", cmd_tambahkata),
+        ("cekbatch", cek_batch),
+        ("cekstrike", cmd_cekstrike),
+        ("resetstrikeall", cmd_resetstrikeall),
+        ("resetbanall", cmd_resetbanall),
+        ("stats", cmd_stats),
+    ]
+    for name, callback in owner_admin:
+        app.add_handler(CommandHandler(name, with_metrics(name, callback)))
+    app.add_handler(
+        MessageHandler(
+            filters.Document.TXT & filters.CaptionRegex(r"^/cekbatch\b"),
+            with_metrics("cekbatch_file", cek_batch),
+        )
+    )
 
     # === Message Handlers ===
     app.add_handler(
-        MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, welcome_new_member)
+        MessageHandler(
+            filters.StatusUpdate.NEW_CHAT_MEMBERS,
+            with_metrics("welcome", welcome_new_member),
+        )
     )
+    # Supergroup: satu pipeline (moderasi → balasan bot sebagai tahap terakhir)
     app.add_handler(
         MessageHandler(
-            filters.TEXT & (filters.REPLY | filters.Entity("mention")), simple_responder
+            filters.TEXT & filters.ChatType.SUPERGROUP,
+            with_metrics("moderasi", moderasi),
         )
     )
+    # Chat lain (pribadi/grup biasa) tidak dimoderasi, hanya dibalas
     app.add_handler(
-        MessageHandler(filters.TEXT & filters.ChatType.SUPERGROUP, moderasi)
+        MessageHandler(
+            filters.TEXT
+            & ~filters.ChatType.SUPERGROUP
+            & (filters.REPLY | filters.Entity("mention")),
+            with_metrics("responder", simple_responder),
+        )
     )
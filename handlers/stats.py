@@ -0,0 +1,116 @@
+import os
+import logging
+from html import escape
+from telegram import Update
+from telegram.ext import ContextTypes
+from dotenv import load_dotenv
+from utils.metrics import (
+    HANDLER_SECONDS,
+    HANDLER_ERRORS,
+    CACHE_LOOKUPS,
+    HTTP_SECONDS,
+    HTTP_RESPONSES,
+)
+from utils.outbound import outbound
+from utils.rate_limiter import rate_limiter
+from utils.persistence import STORES
+from utils.logging_setup import sampling_stats
+
+load_dotenv()
+OWNER_ID = int(os.getenv("MY_TELEGRAM_ID", "0"))
+
+logger = logging.getLogger(__name__)
+
+TOP_HANDLERS = 10
+
+
+def _ms(detik: float) -> str:
+    return f"{detik * 1000:.0f}ms"
+
+
+def format_handlers() -> list:
+    baris = ["⏱️ <b>Handler</b> (jumlah • p50 • p95 • error)"]
+    urut = sorted(
+        HANDLER_SECONDS.values, key=lambda k: HANDLER_SECONDS.count(*k), reverse=True
+    )
+    for labels in urut[:TOP_HANDLERS]:
+        baris.append(
+            f"• {escape(labels[0])}: {HANDLER_SECONDS.count(*labels)} • "
+            f"{_ms(HANDLER_SECONDS.quantile(0.5, *labels))} • "
+            f"{_ms(HANDLER_SECONDS.quantile(0.95, *labels))} • "
+            f"{HANDLER_ERRORS.values.get(labels, 0)}"
+        )
+    return baris
+
+
+def format_pipeline() -> list:
+    from handlers.moderasi import PIPELINE
+
+    baris = [f"🛡️ <b>Pipeline moderasi</b> ({PIPELINE.messages} pesan)"]
+    for nama, s in PIPELINE.stats().items():
+        baris.append(
+            f"• {nama}: jalan {s['jalan']}, lewat {s['lewat']}, "
+            f"stop {s['berhenti']}, deteksi {s['rata2_us']:.0f}µs rata2, "
+            f"aksi {s['aksi']}x {s['aksi_ms']:.0f}ms"
+        )
+    return baris
+
+
+def format_cache() -> list:
+    per_cache = {}
+    for (cache, hasil), n in CACHE_LOOKUPS.values.items():
+        per_cache.setdefault(cache, {})[hasil] = n
+    baris = ["🗂️ <b>Cache</b> (hit rate)"]
+    for cache, hasil in sorted(per_cache.items()):
+        total = sum(hasil.values())
+        hit = hasil.get("hit", 0) + hasil.get("stale", 0)
+        baris.append(f"• {escape(cache)}: {hit / total:.0%} dari {total}")
+    return baris
+
+
+def format_http() -> list:
+    baris = ["🌐 <b>Upstream</b> (request • p50 • p95 • gagal)"]
+    for (host,) in HTTP_SECONDS.values:
+        gagal = sum(
+            n
+            for (h, status), n in HTTP_RESPONSES.values.items()
+            if h == host and not status.startswith(("2", "3"))
+        )
+        baris.append(
+            f"• {escape(host)}: {HTTP_SECONDS.count(host)} • "
+            f"{_ms(HTTP_SECONDS.quantile(0.5, host))} • "
+            f"{_ms(HTTP_SECONDS.quantile(0.95, host))} • {gagal}"
+        )
+    return baris
+
+
+def format_lainnya() -> list:
+    out = outbound.stats()
+    rl = rate_limiter.stats()
+    ditahan = sum(rl["throttled"].values())
+    tertunda = sum(store.pending for store in STORES)
+    return [
+        "📤 <b>Lainnya</b>",
+        f"• Outbound: antrean {out['antrean']}, 429 {out.get('429', 0)}, "
+        f"tunggu maks {out['tunggu_maks']:.1f}s",
+        f"• Rate limit: {ditahan} command ditahan, {rl['buckets']} bucket",
+        f"• Store: {tertunda} perubahan belum ditulis",
+        f"• Log disampling: {sampling_stats()['dibuang']} record",
+    ]
+
+
+async def cmd_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if update.effective_user.id != OWNER_ID:
+        return await update.message.reply_text(
+            "🚫 Perintah ini hanya untuk pemilik bot."
+        )
+
+    bagian = [
+        format_handlers(),
+        format_pipeline(),
+        format_cache(),
+        format_http(),
+        format_lainnya(),
+    ]
+    pesan = "\n\n".join("\n".join(b) for b in bagian)
+    await update.message.reply_text(pesan, parse_mode="HTML")
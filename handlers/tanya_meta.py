@@ -1,3 +1,4 @@
+import asyncio
 from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler
 from meta_ai_api import MetaAI
@@ -23,8 +24,11 @@ async def tanya_meta(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
     try:
-        ai = MetaAI()
-        result = ai.prompt(message=message)
+        # MetaAI memakai HTTP blocking → jalankan di thread agar event loop tetap jalan
+        def tanya():
+            return MetaAI().prompt(message=message)
+
+        result = await asyncio.to_thread(tanya)
 
         msg = (
             result.get("message", "❌ Tidak ada jawaban yang tersedia.")
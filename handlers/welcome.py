@@ -1,5 +1,8 @@
-from telegram import Update
+import time
+from telegram import Update, ChatPermissions
 from telegram.ext import ContextTypes
+from utils.raid_detector import raid_detector, RESTRICT_DURATION
+from utils.outbound import outbound, LANE_BALASAN
 
 WELCOME_MESSAGE = """👋 Selamat datang {mention}!
 
@@ -18,15 +21,34 @@ WELCOME_MESSAGE = """👋 Selamat datang {mention}!
 
 
 async def welcome_new_member(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    for member in update.message.new_chat_members:
-        if member.is_bot:
-            continue  # Jangan sambut bot
-
-        try:
-            await update.message.reply_text(
-                WELCOME_MESSAGE.format(mention=member.mention_html()),
-                parse_mode="HTML",
-                disable_web_page_preview=True,
+    chat_id = update.effective_chat.id
+    members = [m for m in update.message.new_chat_members if not m.is_bot]
+    if not members:
+        return  # Jangan sambut bot
+
+    # Mode raid: batasi member baru lewat antrean, sambutan digabung jadi digest
+    if raid_detector.record_join(chat_id, len(members)):
+        until = int(time.time() + RESTRICT_DURATION)
+        for member in members:
+            raid_detector.add_digest(chat_id, member.mention_html())
+            await raid_detector.run(
+                chat_id,
+                "restrict",
+                context.bot.restrict_chat_member,
+                chat_id,
+                member.id,
+                ChatPermissions(can_send_messages=False),
+                until_date=until,
             )
-        except Exception as e:
-            print(f"Gagal mengirim pesan sambutan: {e}")
+        return
+
+    # Sambutan lewat antrean keluar agar tidak menabrak flood limit grup
+    for member in members:
+        outbound.submit(
+            update.message.reply_text,
+            WELCOME_MESSAGE.format(mention=member.mention_html()),
+            chat_id=chat_id,
+            lane=LANE_BALASAN,
+            parse_mode="HTML",
+            disable_web_page_preview=True,
+        )
@@ -4,7 +4,11 @@ import json
 import logging
 from telegram import Update
 from telegram.ext import ContextTypes
-from .constants import BANNED_FILE, BLACKLIST_LINK, WHITELIST_LINK
+from .constants import BLACKLIST_LINK, WHITELIST_LINK
+from .link_classifier import LinkClassifier, WHITELISTED, SAFE
+from .persistence import banned_users, phishing_cache
+from .raid_detector import raid_detector
+from .metrics import cache_lookup
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,16 +16,8 @@ load_dotenv()
 ADMIN_IDS = list(map(int, os.getenv("ADMIN_LIST", "").split(",")))
 OWNER_ID = int(os.getenv("MY_TELEGRAM_ID", "0"))
 
-CACHE_PHISHING_FILE = "data/cache_phishing_links.json"
-MODERASI_LOG_FILE = "logs/moderasi.log"
-
-# === Setup Logger Moderasi ===
+# Catatan deteksi → logs/moderasi.log (handler dipasang oleh setup_logging)
 moderasi_logger = logging.getLogger("moderasi")
-moderasi_logger.setLevel(logging.INFO)
-if not moderasi_logger.handlers:
-    handler = logging.FileHandler(MODERASI_LOG_FILE, encoding="utf-8")
-    handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
-    moderasi_logger.addHandler(handler)
 
 
 # === Utilitas JSON ===
@@ -34,158 +30,145 @@ def load_json_list(path: str) -> list:
         return []
 
 
-def load_phishing_cache() -> set:
-    try:
-        with open(CACHE_PHISHING_FILE, "r", encoding="utf-8") as f:
-            return set(json.load(f))
-    except (FileNotFoundError, json.JSONDecodeError):
-        return set()
-
-
-def save_phishing_cache(links: set):
-    with open(CACHE_PHISHING_FILE, "w", encoding="utf-8") as f:
-        json.dump(list(links), f, indent=2)
-
-
-def save_banned_user(user_id: int):
-    try:
-        with open(BANNED_FILE, "r", encoding="utf-8") as f:
-            data = set(json.load(f))
-    except (FileNotFoundError, json.JSONDecodeError):
-        data = set()
-    data.add(user_id)
-    with open(BANNED_FILE, "w", encoding="utf-8") as f:
-        json.dump(list(data), f, indent=2)
-    logging.info(f"📁 User {user_id} ditambahkan ke banned_users.json")
-
-
 # === Proses Link ===
 WHITELIST = [w.strip() for w in load_json_list(WHITELIST_LINK)]
 BLACKLIST = [b.strip().lower() for b in load_json_list(BLACKLIST_LINK)]
-PHISHING_CACHE = load_phishing_cache()
+CLASSIFIER = LinkClassifier(WHITELIST, BLACKLIST)
+
+LINK_RE = re.compile(r"(https?:\/\/[^\s]+|https\/\/[^\s]+|t\.me\/[^\s]+|www\.[^\s]+)")
+CENSOR_RE = re.compile(r"(https?:\/\/|https\/\/|www\.|t\.me\/|telegram\.me\/)")
+# Semua yang bisa dicocokkan LINK_RE memuat salah satu penanda ini
+LINK_HINTS = ("http", "t.me/", "www.")
 
+ALASAN = {
+    "blacklist": "cocok blacklist",
+    "telegram": "grup Telegram asing",
+    "pola": "pola link mencurigakan",
+}
 
-def normalize_url(url: str) -> str:
-    return re.sub(r"^(https?:\/\/|https\/\/|www\.)", "", url.strip().lower())
+
+def might_have_link(lower: str) -> bool:
+    """Prefilter murah (teks huruf kecil) sebelum regex link dijalankan."""
+    return any(hint in lower for hint in LINK_HINTS)
 
 
 def extract_links(text: str) -> list:
-    pattern = r"(https?:\/\/[^\s]+|https\/\/[^\s]+|t\.me\/[^\s]+|www\.[^\s]+)"
-    return re.findall(pattern, text)
+    return LINK_RE.findall(text)
 
 
 def censor_link(link: str) -> str:
-    return re.sub(
-        r"(https?:\/\/|https\/\/|www\.|t\.me\/|telegram\.me\/)", "[LINK] ", link
-    )
+    return CENSOR_RE.sub("[LINK] ", link)
 
 
-def is_suspicious(
-    link: str, whitelist: list, blacklist: list, bot_username: str
-) -> bool:
-    domain = normalize_url(link)
+def is_suspicious(link: str, bot_username: str) -> bool:
     bot_username = bot_username or "azizah_bot"
     bot_username = bot_username.lower().strip("@")
 
-    normalized_whitelist = [normalize_url(w) for w in whitelist]
+    verdict, key = CLASSIFIER.classify(link, bot_username)
 
-    # ✅ Cek whitelist dulu
-    if any(w in domain for w in normalized_whitelist):
-        logging.info(f"🟢 Link {link} cocok whitelist.")
+    # ✅ Whitelist selalu menang, termasuk atas cache phishing lama
+    if verdict == WHITELISTED:
+        logging.debug(f"🟢 Link {link} cocok whitelist.")
         return False
 
-    if domain in PHISHING_CACHE:
-        logging.info(f"⚠️ Link {link} ditemukan dalam cache phishing.")
-        return True
-
-    if any(b in domain for b in blacklist):
-        logging.warning(f"⚠️ Link {link} cocok blacklist.")
-        PHISHING_CACHE.add(domain)
-        return True
-
-    # ✅ Grup Telegram asing: t.me/link yang bukan milik bot & tidak di-whitelist
-    if re.search(r"(t\.me\/|telegram\.me\/)", domain):
-        if not domain.endswith(bot_username) and all(
-            w not in domain for w in normalized_whitelist
-        ):
-            logging.warning(f"⚠️ Grup Telegram asing: {link}")
-            PHISHING_CACHE.add(domain)
+    if verdict == SAFE:
+        if key in phishing_cache:
+            cache_lookup("phishing", "hit")
+            logging.info(f"⚠️ Link {link} ditemukan dalam cache phishing.")
             return True
+        cache_lookup("phishing", "miss")
+        logging.debug(f"ℹ️ Link {link} dianggap aman.")
+        return False
 
-    if re.search(
-        r"(bokep|judi|slot|phising|claim|\.xyz|\.click|bit\.ly|tinyurl|grabify|xxx)",
-        domain,
-    ):
-        logging.warning(f"⚠️ Pola link mencurigakan: {link}")
-        PHISHING_CACHE.add(domain)
-        return True
-
-    logging.info(f"ℹ️ Link {link} dianggap aman.")
-    return False
+    logging.warning(f"⚠️ Link {link}: {ALASAN[verdict]}.")
+    phishing_cache.add(key)
+    return True
 
 
 # === Handler Utama ===
-async def handle_phishing(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+def cari_link_mencurigakan(links: list, bot_username: str):
+    """Link mencurigakan pertama di `links` (deteksi sinkron), atau None."""
+    for link in links:
+        logging.debug(f"🔗 Ditemukan link: {link}")
+        if is_suspicious(link, bot_username):
+            return link
+    return None
+
+
+async def handle_phishing(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, links: list = None
+) -> bool:
+    """True jika pesan berisi link mencurigakan (pesan dihapus, user diban).
+
+    `links` boleh diisi pemanggil yang sudah mengekstrak link.
+    """
     msg = update.message
     if not msg or not msg.text:
         logging.debug("🔍 Tidak ada teks untuk dicek.")
         return False
 
-    text = msg.text
-    user_id = msg.from_user.id
-    chat_id = msg.chat.id
-    links = extract_links(text)
+    if links is None:
+        links = extract_links(msg.text)
 
     if not links:
-        logging.info("✅ Tidak ada link yang terdeteksi.")
+        logging.debug("✅ Tidak ada link yang terdeteksi.")
         return False
 
-    for link in links:
-        logging.info(f"🔗 Ditemukan link: {link}")
+    link = cari_link_mencurigakan(links, context.bot.username)
+    if link is None:
+        return False
+    await tindak_phishing(update, context, link)
+    return True
 
-        if not is_suspicious(link, WHITELIST, BLACKLIST, context.bot.username):
-            continue
 
-        moderasi_logger.info(
-            f"[DETEKSI] user_id={user_id} chat_id={chat_id} link={link}"
-        )
+async def tindak_phishing(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, link: str
+):
+    """Hapus pesan berisi `link` mencurigakan lalu ban pengirimnya (kecuali admin)."""
+    msg = update.message
+    user_id = msg.from_user.id
+    chat_id = msg.chat.id
 
-        try:
-            await msg.delete()
-            logging.info(f"🧹 Pesan user {user_id} dihapus.")
-        except Exception as e:
-            logging.error(f"❌ Gagal menghapus pesan: {e}")
-
-        sensor = censor_link(link)
-
-        if user_id == OWNER_ID or user_id in ADMIN_IDS:
-            logging.info(
-                f"🙈 Link mencurigakan dari admin/owner {user_id}. Tidak diban."
-            )
-            await context.bot.send_message(
-                chat_id,
-                f"⚠️ Admin/Owner mengirim link mencurigakan.\n🔗 Link: <code>{sensor}</code>",
-                parse_mode="HTML",
-            )
-            save_phishing_cache(PHISHING_CACHE)
-            return True
+    moderasi_logger.info(
+        f"[DETEKSI] user_id={user_id} chat_id={chat_id} link={link}",
+        extra={"data": {"user_id": user_id, "chat_id": chat_id, "link": link}},
+    )
 
-        try:
-            await context.bot.ban_chat_member(chat_id, user_id)
-            logging.warning(f"🚫 User {user_id} dibanned karena link mencurigakan.")
-            save_banned_user(user_id)
-        except Exception as e:
-            logging.error(f"❌ Gagal memban user: {e}")
+    try:
+        await raid_detector.run(chat_id, "hapus", msg.delete)
+        logging.info(f"🧹 Pesan user {user_id} dihapus.")
+    except Exception as e:
+        logging.error(f"❌ Gagal menghapus pesan: {e}")
+
+    sensor = censor_link(link)
 
+    if user_id == OWNER_ID or user_id in ADMIN_IDS:
+        logging.info(
+            f"🙈 Link mencurigakan dari admin/owner {user_id}. Tidak diban."
+        )
         await context.bot.send_message(
             chat_id,
-            f"🚨 <b>Link mencurigakan terdeteksi</b>\n"
-            f"User {msg.from_user.mention_html()} telah diban.\n"
-            f"🔗 Link: <code>{sensor}</code>",
+            f"⚠️ Admin/Owner mengirim link mencurigakan.\n🔗 Link: <code>{sensor}</code>",
             parse_mode="HTML",
         )
+        return
 
-        save_phishing_cache(PHISHING_CACHE)
-        return True
-
-    return False
+    try:
+        await raid_detector.run(
+            chat_id, "ban", context.bot.ban_chat_member, chat_id, user_id
+        )
+        logging.warning(f"🚫 User {user_id} dibanned karena link mencurigakan.")
+        banned_users.add(user_id)
+    except Exception as e:
+        logging.error(f"❌ Gagal memban user: {e}")
+
+    await raid_detector.run(
+        chat_id,
+        "notice",
+        context.bot.send_message,
+        chat_id,
+        f"🚨 <b>Link mencurigakan terdeteksi</b>\n"
+        f"User {msg.from_user.mention_html()} telah diban.\n"
+        f"🔗 Link: <code>{sensor}</code>",
+        parse_mode="HTML",
+    )
@@ -0,0 +1,142 @@
+# browser_pool.py
+# Pool Chrome headless yang tetap hangat, dijalankan di worker thread.
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))  # recycle setelah N pemakaian
+MAX_WAITING = int(os.getenv("BROWSER_MAX_WAITING", "10"))  # batas antrian
+
+
+class PoolBusy(Exception):
+    """Antrian browser penuh, request ditolak agar bot tidak menumpuk beban."""
+
+
+def buat_driver():
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(options=options)
+
+
+class BrowserPool:
+    """Checkout/return sesi Chrome dengan health check dan recycle.
+
+    Semua operasi Selenium berjalan di ThreadPoolExecutor berukuran sama
+    dengan pool, jadi event loop bot tidak pernah ikut terblokir.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_uses=MAX_USES, max_waiting=MAX_WAITING):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_waiting = max_waiting
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="browser"
+        )
+        self._idle = []  # [(driver, jumlah_pemakaian)]
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._closed = False
+
+    # === Sisi worker thread ===
+    def _sehat(self, driver) -> bool:
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _tutup(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            logger.debug("Gagal menutup driver", exc_info=True)
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                item = self._idle.pop() if self._idle else None
+            if item is None:
+                logger.info("🌐 Membuka sesi Chrome baru untuk pool.")
+                return buat_driver(), 0
+            driver, uses = item
+            if self._sehat(driver):
+                return driver, uses
+            logger.warning("🩺 Sesi Chrome tidak sehat, dibuang dari pool.")
+            self._tutup(driver)
+
+    def _checkin(self, driver, uses, ok):
+        if self._closed or not ok or uses >= self.max_uses:
+            if ok and uses >= self.max_uses:
+                logger.info(f"♻️ Recycle sesi Chrome setelah {uses} pemakaian.")
+            self._tutup(driver)
+            return
+        try:
+            # Bersihkan sesi agar login/cookie tidak bocor ke pemakaian berikutnya
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception:
+            self._tutup(driver)
+            return
+        with self._lock:
+            self._idle.append((driver, uses))
+
+    def _jalankan(self, fn, args):
+        driver, uses = self._checkout()
+        ok = False
+        try:
+            result = fn(driver, *args)
+            ok = True
+            return result
+        finally:
+            self._checkin(driver, uses + 1, ok)
+
+    def _hangatkan(self):
+        with self._lock:
+            kurang = self.size - len(self._idle)
+        for _ in range(max(0, kurang)):
+            try:
+                driver = buat_driver()
+            except Exception:
+                logger.error("❌ Gagal menyiapkan Chrome untuk pool", exc_info=True)
+                return
+            with self._lock:
+                self._idle.append((driver, 0))
+
+    # === Sisi event loop ===
+    async def run(self, fn, *args):
+        """Jalankan `fn(driver, *args)` memakai sesi dari pool di worker thread."""
+        if self._waiting >= self.max_waiting:
+            raise PoolBusy("Antrian browser penuh")
+        self._waiting += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._jalankan, fn, args)
+        finally:
+            self._waiting -= 1
+
+    async def warm(self):
+        """Siapkan sesi sampai ukuran pool (dipanggil saat bot start)."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._hangatkan)
+
+    async def close(self):
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        loop = asyncio.get_running_loop()
+        for driver, _ in idle:
+            await loop.run_in_executor(None, self._tutup, driver)
+        self._executor.shutdown(wait=False)
+
+
+browser_pool = BrowserPool()
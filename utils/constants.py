@@ -8,9 +8,13 @@ PENGUMUMAN_FILE = os.path.join(DATA_DIR, "get_info.json")
 APPROVAL_FILE = os.path.join(DATA_DIR, "approval_status.json")
 PRELIM_FILE = os.path.join(DATA_DIR, "get_prelim.json")
 BANNED_FILE = os.path.join(DATA_DIR, "banned_users.json")
+PHISHING_CACHE_FILE = os.path.join(DATA_DIR, "cache_phishing_links.json")
 RESPON_FILE = os.path.join(DATA_DIR, "respon.json")
 STRIKE_LOG = os.path.join(LOG_DIR, "strike.log")
+STRIKE_FILE = os.path.join(DATA_DIR, "strikes.json")
 EPS_DATA = os.path.join(DATA_DIR, "cache_eps.json")
+EPS_DB = os.path.join(DATA_DIR, "cache_eps.sqlite3")
+FEED_DB = os.path.join(DATA_DIR, "cache_feed.sqlite3")
 EPS_PROGRESS = os.path.join(DATA_DIR, "progress_eps.json")
 MONITOR_INFO = os.path.join(DATA_DIR, "cache_pengumuman.json")
 MONITOR_PRELIM = os.path.join(DATA_DIR, "cache_training.json")
@@ -0,0 +1,87 @@
+# eps_boards.py
+# Registry deklaratif papan tabel hrdkorea.or.kr.
+# Menambah papan baru cukup dengan entri baru di BOARDS (tanpa modul handler baru).
+from utils.constants import EPS_TAHAP1, EPS_FINAL, JADWAL_EPS, JADWAL_REG_EPS
+
+HRDKOREA_BASE = "https://epstopik.hrdkorea.or.kr/epstopik"
+# Descendant (bukan `>`): parser HTML5 seperti selectolax menyisipkan <tbody>
+ROW_SELECTOR = "table.tableType tr[id^='tr_']"
+
+BOARDS = {
+    "tahap1": {
+        "command": "pass1",
+        "guard_key": "get_pass1",
+        "url": f"{HRDKOREA_BASE}/pass/candidate/functionalLevelCandidateList.do?lang=en",
+        "row_selector": ROW_SELECTOR,
+        "columns": ["nation", "title", "type", "date"],
+        "cache_file": EPS_TAHAP1,
+        "cache_key": "tahap1",
+        "ttl": 5 * 60,
+        "label": "tahap 1",
+        "heading": "🧾 Hasil Tahap 1 EPS-TOPIK",
+        "fields": [
+            ("📌 Judul", "title"),
+            ("🧪 Jenis Ujian", "type"),
+            ("🌍 Negara", "nation"),
+            ("📅 Diumumkan", "date"),
+        ],
+    },
+    "final": {
+        "command": "pass2",
+        "guard_key": "get_pass2",
+        "url": f"{HRDKOREA_BASE}/pass/candidate/sucessCandidateList.do?lang=en",
+        "row_selector": ROW_SELECTOR,
+        "columns": ["nation", "title", "type", "date"],
+        "cache_file": EPS_FINAL,
+        "cache_key": "final",
+        "ttl": 5 * 60,
+        "label": "tahap FINAL",
+        "heading": "🏁 Hasil Akhir EPS-TOPIK",
+        "fields": [
+            ("📌 Judul", "title"),
+            ("🧪 Jenis Ujian", "type"),
+            ("🌍 Negara", "nation"),
+            ("📅 Diumumkan", "date"),
+        ],
+    },
+    "jadwal": {
+        "command": "jadwal",
+        "guard_key": "get_jadwal",
+        "url": f"{HRDKOREA_BASE}/abot/exam/sechduleGuideList.do?lang=en",
+        "row_selector": ROW_SELECTOR,
+        "columns": ["nation", "title", "type", "announcement_date"],
+        "cache_file": JADWAL_EPS,
+        "cache_key": "jadwal",
+        "ttl": 30 * 60,
+        "label": "jadwal",
+        "heading": "📅 Jadwal Ujian EPS-TOPIK",
+        "fields": [
+            ("📌 Judul", "title"),
+            ("🧪 Jenis Ujian", "type"),
+            ("🌍 Negara", "nation"),
+            ("📢 Tanggal Pengumuman Jadwal", "announcement_date"),
+        ],
+    },
+    "pendaftaran": {
+        "command": "reg",
+        "guard_key": "get_reg",
+        "url": f"{HRDKOREA_BASE}/abot/exam/selectSechduleDescList.do?lang=en",
+        "row_selector": ROW_SELECTOR,
+        "columns": ["type", "title", "nation", "period", "test_date", "result_date"],
+        "cache_file": JADWAL_REG_EPS,
+        "cache_key": "pendaftaran",
+        "ttl": 30 * 60,
+        "label": "pendaftaran",
+        # Teks error lama /reg dipertahankan (papan lain: "... data {label}.")
+        "error_text": "❌ Terjadi kesalahan saat mengambil data.",
+        "heading": "📝 Pendaftaran EPS-TOPIK",
+        "fields": [
+            ("📌 Judul", "title"),
+            ("🧪 Jenis Ujian", "type"),
+            ("🌍 Negara", "nation"),
+            ("📅 Periode Daftar", "period"),
+            ("🗓️ Jadwal Ujian", "test_date"),
+            ("📢 Hasil", "result_date"),
+        ],
+    },
+}
@@ -0,0 +1,123 @@
+# eps_lookup.py
+# Cek nilai EPS-TOPIK: jalur HTTP langsung (cepat), Selenium hanya sebagai cadangan.
+import logging
+import httpx
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from utils.browser_pool import browser_pool
+from utils.html_parser import find_form
+from utils.http_client import FetchError, fetch_text, session_client
+
+logger = logging.getLogger(__name__)
+
+VISA_URL = "https://www.eps.go.kr/eo/VisaFndRM.eo?langType=in"
+FIELD_NOMOR = "sKorTestNo"
+
+
+class DirectLookupError(Exception):
+    """Jalur HTTP langsung tidak menghasilkan halaman hasil yang bisa dibaca."""
+
+
+# === PARSE HASIL ===
+def parse_hasil_cells(html_text: str) -> list | None:
+    """Teks semua <td> di tabel .tbl_typeA pertama, atau None jika tidak ada."""
+    table = BeautifulSoup(html_text, "html.parser").select_one(".tbl_typeA")
+    if table is None:
+        return None
+    return [
+        cell.get_text(strip=True)
+        for row in table.find_all("tr")
+        for cell in row.find_all("td")
+    ]
+
+
+def cells_to_data(cells: list) -> dict | None:
+    if len(cells) < 12:
+        return None
+    return {
+        "nama": cells[5],
+        "negara": cells[1],
+        "bidang": cells[2],
+        "tanggal": cells[3],
+        "mendengar": cells[6],
+        "bacaan": cells[7],
+        "total": cells[8],
+        "lulus_min": cells[9],
+        "status": cells[10],
+        "masa": cells[11],
+    }
+
+
+# === JALUR CEPAT: FORM POST ===
+async def lookup_direct(nomor_ujian: str) -> list:
+    """GET halaman form (cookie sesi + field hidden), lalu kirim form-nya.
+
+    Tiap lookup memakai client & cookie jar sendiri agar lookup paralel
+    (/cekbatch) tidak berbagi JSESSIONID/field hidden. Tabel hasil tanpa
+    data dianggap final (nomor tidak ditemukan/belum diumumkan).
+    """
+    async with session_client() as client:
+        halaman = await fetch_text(VISA_URL, client=client)
+        form = find_form(halaman, FIELD_NOMOR)
+        if form is None:
+            raise DirectLookupError("Form sKorTestNo tidak ditemukan")
+
+        action, method, fields = form
+        fields[FIELD_NOMOR] = nomor_ujian
+        target = urljoin(VISA_URL, action) if action else VISA_URL
+        headers = {"Referer": VISA_URL}
+
+        if method == "POST":
+            hasil = await fetch_text(
+                target, method="POST", data=fields, headers=headers, client=client
+            )
+        else:
+            hasil = await fetch_text(
+                target, params=fields, headers=headers, client=client
+            )
+
+    # Tanpa tabel .tbl_typeA berarti form ditolak/halaman tak dikenal
+    cells = parse_hasil_cells(hasil)
+    if cells is None:
+        raise DirectLookupError("Tabel hasil tidak ada di respons form")
+    return cells
+
+
+# === CADANGAN: SELENIUM (berjalan di worker thread browser_pool) ===
+def scrape_hasil(driver, nomor_ujian):
+    """Isi nomor ujian di VisaFndRM.eo lewat browser dan baca tabel hasil."""
+    driver.get(VISA_URL)
+
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.ID, FIELD_NOMOR))
+    )
+    input_box = driver.find_element(By.ID, FIELD_NOMOR)
+    input_box.clear()
+    input_box.send_keys(nomor_ujian)
+
+    tombol_view = driver.find_element(By.XPATH, "//button[contains(text(),'View')]")
+    tombol_view.click()
+
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CLASS_NAME, "tbl_typeA"))
+    )
+    return parse_hasil_cells(driver.page_source) or []
+
+
+async def lookup(nomor_ujian: str) -> dict | None:
+    """Data hasil ujian, atau None jika belum diumumkan/tidak ditemukan.
+
+    Selenium hanya dipakai bila jalur langsung gagal di transport atau form
+    tidak bisa dibaca. Exception dari Selenium (termasuk PoolBusy) diteruskan
+    ke pemanggil.
+    """
+    try:
+        cells = await lookup_direct(nomor_ujian)
+        logger.info(f"⚡ {nomor_ujian} diambil lewat jalur HTTP langsung.")
+    except (DirectLookupError, FetchError, httpx.HTTPError) as e:
+        logger.warning(f"↩️ Jalur langsung gagal untuk {nomor_ujian} ({e}), pakai Selenium.")
+        cells = await browser_pool.run(scrape_hasil, nomor_ujian)
+    return cells_to_data(cells)
@@ -0,0 +1,84 @@
+# eps_scraper.py
+# Engine tunggal fetch → parse → diff → simpan untuk semua papan di eps_boards.
+import os
+import json
+import logging
+from utils.eps_boards import BOARDS
+from utils.html_parser import select_rows
+from utils.http_client import fetch_text
+from utils.snapshot_cache import snapshots
+
+logger = logging.getLogger(__name__)
+
+MAX_ROWS = 10
+SNAPSHOT_MAX_STALE = 24 * 60 * 60  # lewat ini wajib scrape ulang
+
+
+# === PARSE ===
+def parse_rows(html_text: str, board: dict) -> list:
+    """Ambil maksimal MAX_ROWS baris tabel sesuai skema kolom papan."""
+    columns = board["columns"]
+    rows = select_rows(html_text, board["row_selector"])
+
+    data = []
+    for kolom in rows[:MAX_ROWS]:
+        if len(kolom) < len(columns):
+            continue
+        data.append(dict(zip(columns, kolom)))
+    return data
+
+
+async def scrape_board(key: str) -> list:
+    board = BOARDS[key]
+    try:
+        html_text = await fetch_text(board["url"])
+        data = parse_rows(html_text, board)
+        if not data:
+            logger.warning(f"⚠️ Tidak ada baris data {board['label']} ditemukan.")
+        return data
+    except Exception:
+        logger.error(f"Gagal ambil data {board['label']}", exc_info=True)
+        return []
+
+
+# === CACHE DISK ===
+def load_cache(key: str) -> list:
+    board = BOARDS[key]
+    if os.path.exists(board["cache_file"]):
+        with open(board["cache_file"], "r", encoding="utf-8") as f:
+            return json.load(f).get(board["cache_key"], [])
+    return []
+
+
+def simpan_cache(key: str, data: list):
+    board = BOARDS[key]
+    with open(board["cache_file"], "w", encoding="utf-8") as f:
+        json.dump({board["cache_key"]: data}, f, indent=2, ensure_ascii=False)
+
+
+def is_data_baru(data_baru: list, data_lama: list) -> bool:
+    judul_baru = [d["title"] for d in data_baru]
+    judul_lama = [d["title"] for d in data_lama]
+    return judul_baru != judul_lama
+
+
+# === SNAPSHOT ===
+def _register(key: str):
+    snapshots.register(
+        key,
+        lambda: scrape_board(key),
+        ttl=BOARDS[key]["ttl"],
+        max_stale=SNAPSHOT_MAX_STALE,
+        load=lambda: load_cache(key),
+        save=lambda data: simpan_cache(key, data),
+        is_changed=is_data_baru,
+    )
+
+
+for _key in BOARDS:
+    _register(_key)
+
+
+async def get_board(key: str) -> list:
+    """Data papan dari snapshot in-memory (refresh otomatis sesuai TTL)."""
+    return await snapshots.get(key)
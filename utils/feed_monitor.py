@@ -0,0 +1,204 @@
+# feed_monitor.py
+# Registry feed yang dipantau (API kp2mi + papan hrdkorea) dan satu siklus
+# fetch paralel dengan request bersyarat: feed yang tidak berubah (304 atau
+# hash body sama) dilewati tanpa parse/diff. Validator request dan baseline
+# diff milik monitor sendiri, terpisah dari fetch command/snapshot.
+import os
+import json
+import time
+import asyncio
+import logging
+from utils.constants import DATA_DIR, MONITOR_INFO, MONITOR_PRELIM
+from utils.eps_boards import BOARDS
+from utils.eps_scraper import parse_rows
+from utils.feed_records import RECORDS
+from utils.http_client import fetch_conditional, fetch_json
+from utils.metrics import FEED_POLLS
+from utils.monitor_utils import cari_item_baru, mask_api_url
+from utils.persistence import JsonSetStore, register_store
+from utils.seen_ids import SeenIdStore
+from utils.snapshot_cache import snapshots
+
+logger = logging.getLogger(__name__)
+
+KP2MI_API = "https://www.kp2mi.go.id/gtog-data/korea"
+PAGE_SIZE = 10
+MAX_PAGES = 5  # batas paging per siklus jika belum ketemu ID yang dikenal
+# Umumkan juga pengumuman lama yang judul/link-nya diedit (default: tidak)
+ANNOUNCE_EDITS = os.getenv("MONITOR_ANNOUNCE_EDITS", "0") == "1"
+# Namespace validator ETag/hash khusus monitor (lihat fetch_conditional)
+VALIDATOR_NAMESPACE = "monitor"
+
+
+def page_url(api: str, start: int) -> str:
+    return f"{api}?start={start}&length={PAGE_SIZE}"
+
+
+FEEDS = {
+    "pengumuman": {
+        "kind": "kp2mi",
+        "api": f"{KP2MI_API}/Pengumuman",
+        "url": page_url(f"{KP2MI_API}/Pengumuman", 0),
+        "cache_file": MONITOR_INFO,
+        "tipe": "pengumuman",
+    },
+    "training": {
+        "kind": "kp2mi",
+        "api": f"{KP2MI_API}/Preliminary%20Training%20dan%20Info",
+        "url": page_url(f"{KP2MI_API}/Preliminary%20Training%20dan%20Info", 0),
+        "cache_file": MONITOR_PRELIM,
+        "tipe": "training",
+    },
+    # Papan hrdkorea: hasil parse sekaligus menyegarkan snapshot command;
+    # cache_file = judul yang sudah dilihat monitor (baseline diff)
+    **{
+        f"eps_{key}": {
+            "kind": "board",
+            "board": key,
+            "url": board["url"],
+            "cache_file": os.path.join(DATA_DIR, f"monitor_{key}.json"),
+            "tipe": board["label"],
+        }
+        for key, board in BOARDS.items()
+    },
+}
+
+
+_seen = {}  # key feed → SeenIdStore
+_board_seen = {}  # key feed → JsonSetStore judul papan
+
+
+def seen_store(key: str) -> SeenIdStore:
+    store = _seen.get(key)
+    if store is None:
+        store = _seen[key] = SeenIdStore(FEEDS[key]["cache_file"])
+    return store
+
+
+def board_seen_store(key: str) -> JsonSetStore:
+    store = _board_seen.get(key)
+    if store is None:
+        store = JsonSetStore(FEEDS[key]["cache_file"], indent=2)
+        _board_seen[key] = register_store(store)
+    return store
+
+
+async def _diff_kp2mi(key: str, text: str) -> list:
+    feed = FEEDS[key]
+    seen = seen_store(key)
+    data = json.loads(text).get("data", [])
+
+    if not len(seen):
+        # Store kosong: tandai halaman pertama saja, jangan umumkan semuanya
+        RECORDS[key].sync(data)
+        seen.add_many(item.get("id") for item in data)
+        seen.save()
+        logger.info(f"📥 Seed {len(seen)} ID {feed['tipe']} tanpa broadcast")
+        return []
+
+    # Halaman berikutnya hanya diambil jika satu halaman penuh berisi ID baru
+    semua = list(data)
+    halaman = 1
+    while (
+        len(data) >= PAGE_SIZE
+        and halaman < MAX_PAGES
+        and not any(item.get("id") in seen for item in data)
+    ):
+        payload = await fetch_json(page_url(feed["api"], halaman * PAGE_SIZE))
+        data = payload.get("data", [])
+        semua.extend(data)
+        halaman += 1
+    if halaman > 1:
+        logger.info(f"📄 {feed['tipe']}: {halaman} halaman diambil sampai ID dikenal")
+
+    RECORDS[key].sync(semua)
+    return cari_item_baru(semua, seen, feed["tipe"])
+
+
+def _diff_board(key: str, text: str) -> list:
+    feed = FEEDS[key]
+    data = parse_rows(text, BOARDS[feed["board"]])
+    if not data:
+        return []
+    # Snapshot command ikut disegarkan, tapi diff hanya memakai baseline monitor
+    # (snapshot bisa sudah ditimpa refresh dari /pass1, /jadwal, dst.)
+    snapshots.put(feed["board"], data)
+
+    seen = board_seen_store(key)
+    baru = [row for row in reversed(data) if row["title"] not in seen]
+    if not baru:
+        return []
+    seed = not len(seen)
+    for row in baru:
+        seen.add(row["title"])
+    seen.flush()
+    if seed:
+        # Baseline kosong: jangan umumkan seluruh isi papan
+        logger.info(f"📥 Seed {len(seen)} judul {feed['tipe']} tanpa broadcast")
+        return []
+    return baru
+
+
+async def poll_feed(key: str) -> dict:
+    """Ambil satu feed; kembalikan status, byte, dan item baru (jika berubah).
+
+    `edits` diisi oleh run_cycle bila MONITOR_ANNOUNCE_EDITS aktif.
+    """
+    feed = FEEDS[key]
+    hasil = {"key": key, "status": "gagal", "bytes": 0, "items": [], "edits": []}
+    try:
+        # Validator baru disimpan hanya setelah diff sukses (lihat commit())
+        res = await fetch_conditional(
+            feed["url"], namespace=VALIDATOR_NAMESPACE, commit=False
+        )
+    except Exception as e:
+        url = mask_api_url(feed["url"])
+        logger.error(f"❌ Gagal mengambil {feed['tipe']} ({url}): {e}")
+        return hasil
+
+    hasil["bytes"] = res.nbytes
+    if not res.changed:
+        res.commit()
+        hasil["status"] = "304" if res.status == 304 else "sama"
+        return hasil
+
+    hasil["status"] = "berubah"
+    try:
+        if feed["kind"] == "kp2mi":
+            hasil["items"] = await _diff_kp2mi(key, res.text)
+        else:
+            hasil["items"] = _diff_board(key, res.text)
+    except Exception:
+        # Validator lama dipertahankan → siklus berikutnya tetap melihat "berubah"
+        logger.exception(f"❌ Gagal memproses data {feed['tipe']}.")
+        hasil["status"] = "gagal"
+        return hasil
+    res.commit()
+    return hasil
+
+
+async def run_cycle(keys=None) -> list:
+    """Satu siklus monitor untuk semua feed (paralel); log biaya per siklus."""
+    keys = list(keys or FEEDS)
+    mulai = time.perf_counter()
+    hasil = await asyncio.gather(*(poll_feed(key) for key in keys))
+    for h in hasil:
+        if FEEDS[h["key"]]["kind"] == "kp2mi":
+            # Termasuk edit yang terdeteksi lewat /get atau /training antarsiklus
+            edits = RECORDS[h["key"]].pop_edits()
+            if ANNOUNCE_EDITS:
+                h["edits"] = edits
+
+    status = {}
+    for h in hasil:
+        status[h["status"]] = status.get(h["status"], 0) + 1
+        FEED_POLLS.inc(h["key"], h["status"])
+    total_kb = sum(h["bytes"] for h in hasil) / 1024
+    baru = sum(len(h["items"]) for h in hasil)
+    logger.info(
+        f"📡 Siklus monitor {time.perf_counter() - mulai:.2f}s: {len(keys)} feed "
+        f"({', '.join(f'{k} {v}' for k, v in sorted(status.items()))}), "
+        f"{total_kb:.1f} KB diunduh, {baru} item baru, "
+        f"{sum(len(h['edits']) for h in hasil)} edit"
+    )
+    return hasil
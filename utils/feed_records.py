@@ -0,0 +1,141 @@
+# feed_records.py
+# Diff per record (kunci `id`) untuk feed kp2mi: item baru, judul/link yang
+# diedit, dan selisih view. Hanya record yang berubah yang ditulis ke SQLite;
+# file JSON (get_info.json / get_prelim.json) hanya ditulis ulang bila ada
+# item baru atau edit, bukan karena view saja.
+import json
+import logging
+from html import unescape
+from typing import NamedTuple
+from utils.constants import FEED_DB, PENGUMUMAN_FILE, PRELIM_FILE
+from utils.html_parser import extract_anchor
+from utils.kv_store import SqliteKV
+from utils.persistence import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+EDIT_FIELDS = ("judul", "link")  # perubahan yang layak diumumkan
+
+
+# === Parser judul & link ===
+def parse_judul_link(html_string):
+    if not html_string or not isinstance(html_string, str):
+        return "Judul tidak ditemukan", "-"
+    anchor = extract_anchor(unescape(html_string))
+    if not anchor or not anchor[1]:
+        return "Judul tidak ditemukan", "-"
+    teks, href = anchor
+    href = href.replace("\\/", "/").strip()
+    if href.startswith("/"):
+        href = f"https://www.kp2mi.go.id{href}"
+    return teks, href
+
+
+def bersihkan_item(item: dict):
+    """Item API → record cache; None jika judul/link tidak bisa dibaca."""
+    judul, link = parse_judul_link(item.get("judul", ""))
+    if judul == "Judul tidak ditemukan" or link == "-":
+        return None
+    return {
+        "id": item.get("id"),
+        "judul": judul,
+        "link": link,
+        "creator": item.get("creator", "-"),
+        "is_active": item.get("is_active", 1),
+        "created_at": item.get("created_at", "-"),
+        "updated_at": item.get("updated_at", "-"),
+        "view": item.get("view", 0),
+        "kategori": item.get("kategori", "-"),
+        "tanggal": item.get("tanggal", "-"),
+    }
+
+
+class FeedDiff(NamedTuple):
+    rows: list  # record terbaru sesuai urutan API
+    inserted: list  # record yang belum pernah tersimpan
+    edited: list  # [(record_baru, record_lama)] bila judul/link berubah
+    views: dict  # id → selisih view
+
+
+class FeedRecords:
+    def __init__(self, json_path: str, table: str):
+        self.json_path = json_path
+        self.kv = SqliteKV(FEED_DB, table)
+        self._rows = None  # id (str) → record, dimuat sekali dari SQLite
+        self._edits = {}  # id → (baru, lama) yang belum diambil monitor
+
+    def _load(self) -> dict:
+        if self._rows is None:
+            self._rows = dict(self.kv.items())
+            if not self._rows:
+                self._seed_from_json()
+        return self._rows
+
+    def _seed_from_json(self):
+        try:
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        rows = {str(row["id"]): row for row in data if row.get("id") is not None}
+        self.kv.put_many(rows)
+        self._rows.update(rows)
+        logger.info(f"📦 Migrasi {len(rows)} record dari {self.json_path}")
+
+    def sync(self, api_data: list) -> FeedDiff:
+        """Bandingkan data API dengan record tersimpan lalu simpan yang berubah."""
+        rows = self._load()
+        terbaru, inserted, edited, views = [], [], [], {}
+        berubah = {}
+        tulis_json = False
+
+        for item in api_data:
+            row = bersihkan_item(item)
+            if row is None or row["id"] is None:
+                continue
+            terbaru.append(row)
+            key = str(row["id"])
+            lama = rows.get(key)
+            if lama == row:
+                continue
+            berubah[key] = row
+            if lama is None:
+                inserted.append(row)
+                tulis_json = True
+                continue
+            if any(lama.get(f) != row[f] for f in EDIT_FIELDS):
+                edited.append((row, lama))
+                self._edits[key] = (row, self._edits.get(key, (None, lama))[1])
+            if any(lama.get(f) != row[f] for f in row if f != "view"):
+                tulis_json = True
+            try:
+                selisih = int(row["view"]) - int(lama.get("view", 0))
+            except (TypeError, ValueError):
+                selisih = 0
+            if selisih:
+                views[row["id"]] = selisih
+
+        if berubah:
+            self.kv.put_many(berubah)
+            rows.update(berubah)
+        if tulis_json and terbaru:
+            atomic_write_json(self.json_path, terbaru, ensure_ascii=False, indent=2)
+
+        logger.info(
+            f"🗂️ {self.kv.table}: {len(inserted)} baru, {len(edited)} diedit, "
+            f"{len(views)} view berubah (+{sum(views.values())}), "
+            f"{len(berubah)} record ditulis"
+        )
+        return FeedDiff(terbaru, inserted, edited, views)
+
+    def pop_edits(self) -> list:
+        """[(record_baru, record_lama)] sejak pemanggilan terakhir."""
+        hasil = list(self._edits.values())
+        self._edits.clear()
+        return hasil
+
+
+RECORDS = {
+    "pengumuman": FeedRecords(PENGUMUMAN_FILE, "pengumuman"),
+    "training": FeedRecords(PRELIM_FILE, "training"),
+}
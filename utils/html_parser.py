@@ -0,0 +1,147 @@
+# html_parser.py
+# Backend parsing HTML yang bisa diganti: selectolax (C, default) → lxml → html.parser.
+import os
+import re
+import logging
+from html import unescape
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:  # pragma: no cover - opsional
+    _SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401
+except ImportError:  # pragma: no cover - opsional
+    lxml = None
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+
+def available_backends() -> list:
+    tersedia = []
+    if _SelectolaxParser is not None:
+        tersedia.append("selectolax")
+    if lxml is not None:
+        tersedia.append("lxml")
+    tersedia.append("html.parser")
+    return tersedia
+
+
+def _pilih_backend() -> str:
+    diminta = os.getenv("HTML_PARSER_BACKEND", "").strip().lower()
+    tersedia = available_backends()
+    if diminta:
+        if diminta in tersedia:
+            return diminta
+        logger.warning(
+            f"⚠️ Backend parser '{diminta}' tidak tersedia, pakai {tersedia[0]}."
+        )
+    return tersedia[0]
+
+
+BACKEND = _pilih_backend()
+
+
+# === BARIS TABEL ===
+def _rows_selectolax(html_text, selector, cell_selector):
+    tree = _SelectolaxParser(html_text)
+    return [
+        [cell.text(deep=True, separator="", strip=True) for cell in row.css(cell_selector)]
+        for row in tree.css(selector)
+    ]
+
+
+def _rows_soup(html_text, selector, cell_selector, features):
+    soup = BeautifulSoup(html_text, features)
+    return [
+        [cell.get_text(strip=True) for cell in row.select(cell_selector)]
+        for row in soup.select(selector)
+    ]
+
+
+def select_rows(html_text: str, selector: str, cell_selector: str = "td", backend=None):
+    """Kembalikan teks sel per baris untuk setiap elemen yang cocok `selector`.
+
+    Catatan: selectolax mengikuti HTML5 sehingga <tbody> implisit selalu ada,
+    jadi selector baris sebaiknya memakai descendant (`table tr`), bukan `>`.
+    """
+    backend = backend or BACKEND
+    if backend == "selectolax":
+        return _rows_selectolax(html_text, selector, cell_selector)
+    if backend == "lxml":
+        return _rows_soup(html_text, selector, cell_selector, "lxml")
+    return _rows_soup(html_text, selector, cell_selector, "html.parser")
+
+
+# === TAG <a> DARI FRAGMEN JUDUL ===
+_ANCHOR_RE = re.compile(
+    r"<a\b[^>]*?\bhref\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))[^>]*>(.*?)</a\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_ANCHOR_NO_HREF_RE = re.compile(r"<a\b[^>]*>(.*?)</a\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _teks_strip(inner_html: str) -> str:
+    # Setara get_text(strip=True): strip tiap potongan teks lalu gabungkan
+    return "".join(
+        unescape(bagian).strip() for bagian in _TAG_RE.split(inner_html)
+    )
+
+
+def extract_anchor(fragment: str):
+    """Ambil (teks, href) dari <a> pertama di fragmen HTML pendek.
+
+    Jalur cepat berbasis regex; fallback ke html.parser bila fragmen aneh.
+    Mengembalikan None jika tidak ada tag <a>.
+    """
+    if "<a" not in fragment and "<A" not in fragment:
+        return None
+
+    m = _ANCHOR_RE.search(fragment)
+    if m:
+        href = m.group(1) if m.group(1) is not None else m.group(2) or m.group(3) or ""
+        return _teks_strip(m.group(4)), unescape(href)
+
+    m = _ANCHOR_NO_HREF_RE.search(fragment)
+    if m:
+        return _teks_strip(m.group(1)), ""
+
+    # Fragmen tidak rapi (mis. tag tidak ditutup) → parser penuh
+    a = BeautifulSoup(fragment, "html.parser").find("a")
+    if not a:
+        return None
+    return a.get_text(strip=True), a.get("href", "")
+
+
+# === FORM ===
+def find_form(html_text: str, field_id: str):
+    """Cari <form> yang memuat input `field_id`.
+
+    Mengembalikan (action, method, {nama: nilai}) berisi semua input/select
+    bawaan form (termasuk hidden/token), atau None bila form tidak ada.
+    """
+    soup = BeautifulSoup(html_text, "html.parser")
+    field = soup.find(id=field_id)
+    form = field.find_parent("form") if field else None
+    if form is None:
+        return None
+
+    values = {}
+    for inp in form.find_all(["input", "select", "textarea"]):
+        name = inp.get("name")
+        tipe = inp.get("type")
+        if not name or tipe in ("button", "submit", "image", "reset"):
+            continue
+        if tipe in ("checkbox", "radio") and not inp.has_attr("checked"):
+            continue
+        if inp.name == "select":
+            selected = inp.find("option", selected=True) or inp.find("option")
+            values[name] = selected.get("value", "") if selected else ""
+        else:
+            values[name] = inp.get("value", "")
+    return form.get("action", ""), (form.get("method") or "GET").upper(), values
@@ -0,0 +1,207 @@
+# http_client.py
+import time
+import asyncio
+import hashlib
+import logging
+from typing import NamedTuple
+from urllib.parse import urlparse
+
+import httpx
+
+from utils.metrics import HTTP_SECONDS, HTTP_RESPONSES
+
+logger = logging.getLogger(__name__)
+
+# === KONFIGURASI ===
+USER_AGENT = "Mozilla/5.0"
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+MAX_RETRIES = 2  # total percobaan = 1 + MAX_RETRIES
+RETRY_BACKOFF = 0.5  # detik, dikali 2^percobaan
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Batas koneksi paralel per host (host lain memakai DEFAULT_HOST_LIMIT)
+HOST_LIMITS = {
+    "www.kp2mi.go.id": 4,
+    "epstopik.hrdkorea.or.kr": 2,
+    "www.eps.go.kr": 2,
+}
+DEFAULT_HOST_LIMIT = 4
+
+_client: httpx.AsyncClient | None = None
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+# (namespace, url) → etag/last_modified/hash/text terakhir
+_validators: dict[tuple, dict] = {}
+
+
+class FetchError(Exception):
+    """Gagal mengambil data dari upstream setelah semua percobaan."""
+
+
+def get_client() -> httpx.AsyncClient:
+    """Client bersama dengan keep-alive pooling (dibuat sekali per proses)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=30.0,
+            ),
+            follow_redirects=True,
+        )
+    return _client
+
+
+def session_client() -> httpx.AsyncClient:
+    """Client berumur pendek dengan cookie jar sendiri (alur form ber-sesi).
+
+    Pakai dengan `async with`, lalu teruskan ke fetch(..., client=...).
+    """
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        timeout=DEFAULT_TIMEOUT,
+        follow_redirects=True,
+    )
+
+
+async def close_client():
+    """Tutup client bersama (dipanggil saat bot shutdown)."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def _host_semaphore(host: str) -> asyncio.Semaphore:
+    sem = _host_semaphores.get(host)
+    if sem is None:
+        sem = asyncio.Semaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+        _host_semaphores[host] = sem
+    return sem
+
+
+# === REQUEST DENGAN RETRY ===
+async def fetch(
+    url: str,
+    method: str = "GET",
+    *,
+    headers: dict | None = None,
+    params: dict | None = None,
+    data: dict | None = None,
+    timeout: float | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> httpx.Response:
+    """Kirim request dengan batas per host, timeout, dan retry + backoff."""
+    host = urlparse(url).netloc
+    client = client or get_client()
+    last_error = None
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with _host_semaphore(host):
+                mulai = time.perf_counter()
+                try:
+                    response = await client.request(
+                        method,
+                        url,
+                        headers=headers,
+                        params=params,
+                        data=data,
+                        timeout=timeout if timeout is not None else DEFAULT_TIMEOUT,
+                    )
+                except httpx.TransportError as e:
+                    HTTP_RESPONSES.inc(host, type(e).__name__)
+                    raise
+                finally:
+                    HTTP_SECONDS.observe(time.perf_counter() - mulai, host)
+            HTTP_RESPONSES.inc(host, str(response.status_code))
+            if response.status_code == 304:
+                return response  # Not Modified (request bersyarat)
+            if response.status_code in RETRY_STATUS:
+                last_error = FetchError(f"HTTP {response.status_code} dari {host}")
+            else:
+                response.raise_for_status()
+                return response
+        except httpx.TransportError as e:
+            last_error = e
+        except httpx.HTTPStatusError as e:
+            # 4xx selain 429 tidak perlu diulang
+            raise FetchError(str(e)) from e
+
+        if attempt < MAX_RETRIES:
+            delay = RETRY_BACKOFF * (2**attempt)
+            logger.warning(
+                f"🔁 Retry {attempt + 1}/{MAX_RETRIES} ke {host} dalam {delay:.1f}s: {last_error}"
+            )
+            await asyncio.sleep(delay)
+
+    raise FetchError(f"Gagal mengambil {host}: {last_error}") from last_error
+
+
+async def fetch_text(url: str, **kwargs) -> str:
+    response = await fetch(url, **kwargs)
+    return response.text
+
+
+async def fetch_json(url: str, **kwargs):
+    response = await fetch(url, **kwargs)
+    return response.json()
+
+
+class ConditionalResult(NamedTuple):
+    changed: bool  # False jika 304 atau isi body sama dengan sebelumnya
+    text: str  # body terbaru (dari cache bila tidak berubah)
+    status: int
+    nbytes: int  # byte yang benar-benar diunduh
+    key: tuple = None  # (namespace, url)
+    validators: dict = None  # validator baru, None jika tidak ada yang disimpan
+
+    def commit(self):
+        """Simpan validator baru (untuk fetch_conditional(..., commit=False))."""
+        if self.validators is not None:
+            _validators[self.key] = self.validators
+
+
+async def fetch_conditional(
+    url: str, *, namespace: str = "default", commit: bool = True, **kwargs
+) -> ConditionalResult:
+    """GET dengan If-None-Match/If-Modified-Since + hash body.
+
+    Validator disimpan per (namespace, url) di memori proses. `changed` relatif
+    terhadap fetch terakhir di namespace yang sama, jadi pemanggil yang butuh
+    diff sendiri (feed monitor) wajib memakai namespace miliknya. Dengan
+    `commit=False` validator baru baru disimpan saat pemanggil memanggil
+    `.commit()` (setelah body berhasil diproses), supaya kegagalan diff tidak
+    membuat perubahan terlewat di siklus berikutnya.
+    """
+    key = (namespace, url)
+    lama = _validators.get(key)
+    headers = dict(kwargs.pop("headers", None) or {})
+    if lama:
+        if lama["etag"]:
+            headers["If-None-Match"] = lama["etag"]
+        if lama["last_modified"]:
+            headers["If-Modified-Since"] = lama["last_modified"]
+
+    response = await fetch(url, headers=headers, **kwargs)
+    if response.status_code == 304 and lama:
+        return ConditionalResult(False, lama["text"], 304, 0)
+
+    body = response.content
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    changed = lama is None or lama["hash"] != digest
+    text = response.text if changed else lama["text"]
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "hash": digest,
+        "text": text,
+    }
+    result = ConditionalResult(
+        changed, text, response.status_code, len(body), key, validators
+    )
+    if commit:
+        result.commit()
+    return result
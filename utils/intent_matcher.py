@@ -0,0 +1,131 @@
+# intent_matcher.py
+# Pencocokan intent fuzzy untuk responder: frasa kunci (nama kategori +
+# alias) dipecah jadi trigram karakter sekali saat load, lalu disimpan di
+# inverted index. Per pesan hanya frasa yang berbagi trigram dengan pesan
+# yang dinilai, dan frasa dicocokkan di bagian mana pun dari pesan (jendela
+# kata), bukan terhadap seluruh pesan. Alias cukup muncul sebagai substring
+# ("puji" di "dipuji"), sama seperti cek `in` lama.
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+
+CUTOFF = 0.7  # sama dengan cutoff difflib sebelumnya
+MIN_CONTAINMENT = 0.5  # porsi trigram frasa yang harus muncul di pesan
+MAX_VERIFY = 5  # kandidat teratas yang dicek per jendela kata
+NON_WORD_RE = re.compile(r"[\W_]+")  # tanda baca, emoji, garis bawah
+
+
+def normalisasi(teks: str) -> str:
+    """Huruf kecil, tanda baca/emoji jadi spasi ("halo!" → "halo")."""
+    return " ".join(NON_WORD_RE.sub(" ", teks.lower()).split())
+
+
+def trigrams(teks: str, pad: bool = True) -> set:
+    padded = f" {teks} " if pad or len(teks) < 3 else teks
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a: set, b: set) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+
+class IntentMatcher:
+    def __init__(self, phrases: dict, cutoff: float = CUTOFF, aliases: dict = None):
+        """`phrases`/`aliases`: {kategori: [frasa, ...]}.
+
+        Frasa harus muncul per kata utuh, alias cukup sebagai substring.
+        Urutan kategori (alias dulu) menjadi prioritas saat skor seri.
+        """
+        self.cutoff = cutoff
+        # (teks, kategori, trigram, jumlah_kata, prioritas, substring)
+        self._phrases = []
+        self._sizes = []  # jumlah trigram per frasa (penyebut containment)
+        self._index = defaultdict(list)  # trigram → [id frasa]
+        aliases = aliases or {}
+        prioritas = {}
+        for kategori in chain(aliases, phrases):
+            prioritas.setdefault(kategori, len(prioritas))
+        for substring, sumber in ((True, aliases), (False, phrases)):
+            for kategori, daftar in sumber.items():
+                for frasa in daftar:
+                    self._add(frasa, kategori, prioritas[kategori], substring)
+
+    def _add(self, frasa: str, kategori, prioritas: int, substring: bool):
+        teks = normalisasi(frasa)
+        if not teks:
+            return
+        # Alias diindeks tanpa padding spasi agar "puji" tetap 100% ada di "memuji"
+        grams = trigrams(teks, pad=not substring)
+        pid = len(self._phrases)
+        self._phrases.append(
+            (teks, kategori, grams, len(teks.split()), prioritas, substring)
+        )
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._index[gram].append(pid)
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def match(self, pesan: str):
+        """Kategori terbaik untuk `pesan`, atau None jika tidak ada di atas cutoff."""
+        pesan = normalisasi(pesan)
+        if not pesan:
+            return None
+
+        # Hitung trigram bersama per frasa lewat posting list (counting di C)
+        index = self._index
+        hits = Counter(chain.from_iterable(index.get(g, ()) for g in trigrams(pesan)))
+
+        sizes = self._sizes
+        kandidat = []
+        for pid, n in hits.items():
+            containment = n / sizes[pid]
+            if containment >= MIN_CONTAINMENT:
+                kandidat.append((containment, len(self._phrases[pid][0]), pid))
+        if not kandidat:
+            return None
+        kandidat.sort(reverse=True)
+
+        # Tahap 1: frasa yang muncul utuh (batas kata; alias: substring) selalu
+        # menang dari fuzzy; seri → frasa lebih panjang → prioritas
+        padded = f" {pesan} "
+        exact = [
+            (len(teks), -prioritas, kategori)
+            for containment, _, pid in kandidat
+            if containment == 1.0
+            for teks, kategori, _, _, prioritas, substring in (self._phrases[pid],)
+            if (teks in pesan if substring else f" {teks} " in padded)
+        ]
+        if exact:
+            return max(exact)[2]
+
+        # Tahap 2: Dice trigram per jendela kata untuk kandidat teratas saja
+        kata = pesan.split()
+        jendela = {}  # (awal, ukuran) → trigram, dipakai bersama antarkandidat
+        terbaik = None
+        for _, _, pid in kandidat[:MAX_VERIFY]:
+            teks, kategori, grams, n, prioritas, _ = self._phrases[pid]
+            skor = self._fuzzy(grams, n, kata, jendela)
+            if skor < self.cutoff:
+                continue
+            kunci = (skor, len(teks), -prioritas)
+            if terbaik is None or kunci > terbaik[0]:
+                terbaik = (kunci, kategori)
+        return terbaik[1] if terbaik else None
+
+    @staticmethod
+    def _fuzzy(grams: set, n: int, kata: list, jendela: dict) -> float:
+        """Dice trigram terbaik antara frasa dan jendela ±1 kata di pesan."""
+        terbaik = 0.0
+        for ukuran in {max(n - 1, 1), n, n + 1}:
+            for i in range(max(len(kata) - ukuran + 1, 1)):
+                grams_jendela = jendela.get((i, ukuran))
+                if grams_jendela is None:
+                    grams_jendela = jendela[(i, ukuran)] = trigrams(
+                        " ".join(kata[i : i + ukuran])
+                    )
+                skor = _dice(grams, grams_jendela)
+                if skor > terbaik:
+                    terbaik = skor
+        return terbaik
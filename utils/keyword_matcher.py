@@ -0,0 +1,83 @@
+# keyword_matcher.py
+# Automaton Aho-Corasick: semua kategori kata kunci dicek dalam satu kali jalan.
+
+
+class KeywordMatcher:
+    """Multi-pattern matcher untuk {kategori: [kata, ...]}.
+
+    Dibangun sekali lalu immutable; untuk menambah kata, bangun instance baru
+    dan tukar referensinya (atomic bagi pembaca di event loop).
+    """
+
+    __slots__ = ("_goto", "_fail", "_out", "categories")
+
+    def __init__(self, categories: dict):
+        self.categories = tuple(categories)
+        goto = [{}]
+        out = [set()]
+
+        # 1) Trie dari semua kata
+        for kategori, kata_list in categories.items():
+            for kata in kata_list:
+                # Spasi tidak dibuang: pemanggil bisa memakai " kata " sebagai batas token
+                kata = kata.lower()
+                if not kata.strip():
+                    continue
+                state = 0
+                for ch in kata:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        out.append(set())
+                    state = nxt
+                out[state].add((kategori, kata))
+
+        # 2) Fail link (BFS) + gabungkan output dari suffix
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        i = 0
+        while i < len(queue):
+            state = queue[i]
+            i += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] |= out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [frozenset(o) for o in out]
+
+    def _scan(self, text: str):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield out[state]
+
+    def find(self, text: str) -> set:
+        """Kategori yang muncul di `text` (berhenti begitu semua kategori kena)."""
+        hits = set()
+        total = len(self.categories)
+        for found in self._scan(text):
+            for kategori, _ in found:
+                hits.add(kategori)
+            if len(hits) == total:
+                break
+        return hits
+
+    def matches(self, text: str) -> dict:
+        """{kategori: {kata yang cocok}} untuk logging/debug."""
+        hasil = {}
+        for found in self._scan(text):
+            for kategori, kata in found:
+                hasil.setdefault(kategori, set()).add(kata)
+        return hasil
@@ -0,0 +1,130 @@
+# kv_store.py
+# Penyimpanan key → JSON berbasis SQLite: lookup O(1) via primary key,
+# upsert per record, dan tulis aman-crash (journal WAL).
+import os
+import json
+import time
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteKV:
+    """Tabel `key TEXT PRIMARY KEY, value TEXT (JSON)` di satu file SQLite."""
+
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = table
+        self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str):
+        row = self.conn.execute(
+            f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, keys) -> dict:
+        keys = list(keys)
+        hasil = {}
+        # Batas parameter SQLite (default 999) → pecah per 500
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for key, value in self.conn.execute(
+                f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})",
+                chunk,
+            ):
+                hasil[key] = json.loads(value)
+        return hasil
+
+    def __contains__(self, key: str) -> bool:
+        return (
+            self.conn.execute(
+                f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def __len__(self) -> int:
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def put(self, key: str, value):
+        """Upsert satu record dalam satu transaksi."""
+        with self.conn:
+            self.conn.execute(
+                f"INSERT INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                "updated_at = excluded.updated_at",
+                (key, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+
+    def _upsert_many(self, items: dict):
+        now = time.time()
+        self.conn.executemany(
+            f"INSERT INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+            "updated_at = excluded.updated_at",
+            [
+                (key, json.dumps(value, ensure_ascii=False), now)
+                for key, value in items.items()
+            ],
+        )
+
+    def put_many(self, items: dict):
+        with self.conn:
+            self._upsert_many(items)
+
+    def delete(self, key: str):
+        with self.conn:
+            self.conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def items(self):
+        for key, value in self.conn.execute(f"SELECT key, value FROM {self.table}"):
+            yield key, json.loads(value)
+
+    def migrate_json(self, json_path: str):
+        """Impor sekali dari file JSON lama `{key: value}` (file lama tidak diubah)."""
+        flag = f"migrated:{self.table}:{os.path.basename(json_path)}"
+        if self.conn.execute("SELECT 1 FROM _meta WHERE key = ?", (flag,)).fetchone():
+            return
+        data = {}
+        if os.path.exists(json_path):
+            try:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                logger.warning(f"⚠️ Gagal membaca {json_path} untuk migrasi", exc_info=True)
+                return
+        # Record yang sudah ada di SQLite lebih baru → jangan ditimpa
+        baru = {k: v for k, v in data.items() if k not in self}
+        with self.conn:
+            self._upsert_many(baru)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO _meta (key, value) VALUES (?, ?)",
+                (flag, str(time.time())),
+            )
+        logger.info(f"📦 Migrasi {len(baru)} record dari {json_path} ke {self.path}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
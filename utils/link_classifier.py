@@ -0,0 +1,175 @@
+# link_classifier.py
+# Klasifikasi link untuk anti-phishing: host di-parse sekali, whitelist/blacklist
+# domain disimpan di trie label terbalik (com → github → ...), dan verdict per
+# host di-cache LRU sehingga cek per link ~O(panjang host).
+import re
+from functools import lru_cache
+from utils.keyword_matcher import KeywordMatcher
+
+SCHEME_RE = re.compile(r"^(?:https?:?//|www\.)+")
+HOST_END_RE = re.compile(r"[/?#]")
+IPV4_RE = re.compile(r"^\d{1,3}(?:\.\d{1,3}){3}$")
+
+# Suffix publik dua label yang umum di grup ini (Indonesia/Korea + beberapa lain)
+# fmt: off
+MULTI_PART_SUFFIXES = frozenset(
+    {
+        "co.id", "go.id", "or.id", "ac.id", "sch.id", "web.id", "my.id",
+        "net.id", "biz.id", "mil.id", "ponpes.id", "desa.id",
+        "co.kr", "go.kr", "or.kr", "ac.kr", "ne.kr", "re.kr", "pe.kr",
+        "co.uk", "org.uk", "ac.uk", "gov.uk",
+        "com.au", "co.jp", "com.sg", "com.my", "com.ph", "com.vn", "com.br",
+    }
+)
+# fmt: on
+
+TELEGRAM_HOSTS = frozenset({"t.me", "telegram.me", "telegram.dog"})
+SHORTENERS = frozenset(
+    {"bit.ly", "tinyurl.com", "grabify.link", "cutt.ly", "s.id", "shorturl.at"}
+)
+SUSPICIOUS_TLDS = frozenset({"xyz", "click", "top", "icu", "buzz"})
+SUSPICIOUS_WORDS = ("bokep", "judi", "slot", "phising", "claim", "grabify", "xxx")
+
+SAFE = "aman"
+WHITELISTED = "whitelist"
+CHECK_PATH = "cek_path"  # verdict host belum final, bergantung pada path
+
+
+def split_link(link: str):
+    """'https://www.GitHub.com:443/Ardhi9696?x' → ('github.com', 'ardhi9696?x')."""
+    link = SCHEME_RE.sub("", link.strip().lower())
+    m = HOST_END_RE.search(link)
+    host, path = (link[: m.start()], link[m.start() :]) if m else (link, "")
+    host = host.rsplit("@", 1)[-1].split(":", 1)[0].strip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host, path.lstrip("/")
+
+
+def public_suffix(host: str) -> str:
+    labels = host.rsplit(".", 2)
+    if len(labels) >= 2 and ".".join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return ".".join(labels[-2:])
+    return labels[-1]
+
+
+def registrable_domain(host: str) -> str:
+    """Domain yang bisa didaftarkan: 'a.b.eps.go.kr' → 'eps.go.kr'."""
+    if IPV4_RE.match(host):
+        return host
+    suffix = public_suffix(host)
+    rest = host[: -len(suffix)].rstrip(".")
+    if not rest:
+        return host
+    return rest.rsplit(".", 1)[-1] + "." + suffix
+
+
+class DomainTrie:
+    """Trie label domain terbalik; entri berlaku untuk host itu & subdomainnya.
+
+    Tiap entri menyimpan daftar awalan path ("" = seluruh host).
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, host: str, path: str = ""):
+        node = self._root
+        for label in reversed(host.split(".")):
+            node = node.setdefault(label, {})
+        node.setdefault(None, []).append(path.rstrip("/"))
+
+    def lookup(self, host: str) -> list:
+        """Semua awalan path dari entri yang cocok dengan host (atau parent-nya)."""
+        node = self._root
+        found = []
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found.extend(node.get(None, ()))
+        return found
+
+
+def path_matches(path: str, prefix: str) -> bool:
+    """Awalan per segmen: 'ardhi9696' cocok 'ardhi9696/x', bukan 'ardhi9696.evil'."""
+    if not prefix:
+        return True
+    if not path.startswith(prefix):
+        return False
+    return len(path) == len(prefix) or path[len(prefix)] in "/?#"
+
+
+class LinkClassifier:
+    def __init__(self, whitelist: list, blacklist: list):
+        self.whitelist = DomainTrie()
+        self.blacklist = DomainTrie()
+        blacklist_words = []
+
+        for entry in whitelist:
+            host, path = split_link(entry)
+            if host and host != public_suffix(host):
+                self.whitelist.add(host, path)
+        for entry in blacklist:
+            host, path = split_link(entry)
+            if "." in host and host != public_suffix(host):
+                self.blacklist.add(host, path)
+            elif entry.strip():
+                # Entri tanpa domain ("slot", "judi") = kata kunci di mana saja
+                blacklist_words.append(entry.strip().lower())
+
+        self.blacklist_words = KeywordMatcher({"BLACKLIST": blacklist_words})
+        self.suspicious_words = KeywordMatcher({"POLA": SUSPICIOUS_WORDS})
+        self._host_verdict = lru_cache(maxsize=4096)(self._classify_host)
+
+    def _classify_host(self, host: str) -> str:
+        """Verdict yang hanya bergantung pada host (di-cache)."""
+        if not host:
+            return CHECK_PATH
+        if any(not p for p in self.blacklist.lookup(host)):
+            return "blacklist"
+        if self.blacklist_words.find(host):
+            return "blacklist"
+        if registrable_domain(host) in SHORTENERS:
+            return "pola"
+        if public_suffix(host) in SUSPICIOUS_TLDS:
+            return "pola"
+        if self.suspicious_words.find(host):
+            return "pola"
+        return CHECK_PATH
+
+    def classify(self, link: str, bot_username: str) -> tuple:
+        """Mengembalikan (verdict, key).
+
+        verdict salah satu dari 'whitelist', 'aman', 'blacklist', 'telegram',
+        'pola'; `key` adalah bentuk ternormalisasi 'host/path' (kunci cache).
+        """
+        host, path = split_link(link)
+        key = f"{host}/{path}" if path else host
+
+        if any(path_matches(path, p) for p in self.whitelist.lookup(host)):
+            return WHITELISTED, key
+
+        verdict = self._host_verdict(host)
+        if verdict != CHECK_PATH:
+            return verdict, key
+
+        if any(path_matches(path, p) for p in self.blacklist.lookup(host)):
+            return "blacklist", key
+        if path and self.blacklist_words.find(path):
+            return "blacklist", key
+
+        # Grup Telegram asing: t.me/<nama> yang bukan bot sendiri & tidak di-whitelist
+        if host in TELEGRAM_HOSTS:
+            nama = HOST_END_RE.split(path, 1)[0]
+            if nama and nama != bot_username:
+                return "telegram", key
+
+        if path and self.suspicious_words.find(path):
+            return "pola", key
+        return SAFE, key
+
+    def cache_info(self):
+        return self._host_verdict.cache_info()
@@ -0,0 +1,185 @@
+# logging_setup.py
+# Satu titik konfigurasi logging: event loop hanya memasukkan record ke
+# antrean (QueueHandler), penulisan file/konsol dilakukan thread
+# QueueListener. File utama berisi JSON per baris, log INFO/DEBUG frekuensi
+# tinggi disampling per lokasi pemanggilan, dan log khusus (moderasi, strike)
+# diarahkan ke filenya masing-masing.
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from colorlog import ColoredFormatter
+from utils.constants import LOG_DIR, STRIKE_LOG
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_FILE = os.path.join(LOG_DIR, "log.jsonl")
+ERROR_LOG_FILE = os.path.join(LOG_DIR, "error.log")
+MODERASI_LOG_FILE = os.path.join(LOG_DIR, "moderasi.log")
+
+# Sampling: per lokasi log (logger + baris), maksimal SAMPLE_BURST record
+# INFO/DEBUG per SAMPLE_WINDOW detik; WARNING ke atas selalu lolos
+SAMPLE_BURST = 20
+SAMPLE_WINDOW = 60.0
+# Logger audit yang tidak boleh disampling
+UNSAMPLED = ("moderasi", "strike")
+
+# Matikan log verbose dari lib lain
+QUIET_LOGGERS = (
+    "httpx",
+    "telegram.vendor.ptb_urllib3.urllib3",
+    "telegram.ext._application",
+)
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu objek JSON per baris; field tambahan lewat `extra={"data": {...}}`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        hasil = {
+            "ts": datetime.fromtimestamp(record.created).strftime(TIME_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        data = getattr(record, "data", None)
+        if isinstance(data, dict):
+            hasil.update(data)
+        disampling = getattr(record, "sampled_out", 0)
+        if disampling:
+            hasil["sampled_out"] = disampling
+        if record.exc_text:
+            hasil["exc"] = record.exc_text
+        return json.dumps(hasil, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Batasi record INFO/DEBUG per lokasi pemanggilan (token per window).
+
+    Record pertama yang lolos setelah ada yang dibuang membawa atribut
+    `sampled_out` berisi jumlah record yang dibuang sejak itu.
+    """
+
+    def __init__(self, burst: int = SAMPLE_BURST, window: float = SAMPLE_WINDOW):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.dropped = 0
+        self._sites = {}  # (logger, baris) → [awal_window, jumlah, dibuang]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or record.name.startswith(UNSAMPLED):
+            return True
+        key = (record.name, record.lineno)
+        now = time.monotonic()
+        site = self._sites.get(key)
+        if site is None or now - site[0] >= self.window:
+            dibuang = site[2] if site else 0
+            site = self._sites[key] = [now, 0, 0]
+            if dibuang:
+                record.sampled_out = dibuang
+        site[1] += 1
+        if site[1] > self.burst:
+            site[2] += 1
+            self.dropped += 1
+            return False
+        return True
+
+
+class _QueueHandler(QueueHandler):
+    # Gabungkan args & traceback di thread pemanggil, tapi biarkan format akhir
+    # (JSON/teks) ke handler di thread listener
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _file_handler(path: str, formatter, level=logging.NOTSET, name: str = None):
+    handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+    handler.setLevel(level)
+    handler.setFormatter(formatter)
+    if name:
+        handler.addFilter(logging.Filter(name))
+    return handler
+
+
+def setup_logging(level=logging.INFO, console: bool = True) -> QueueListener:
+    """Pasang QueueHandler di root logger dan jalankan listener (sekali saja)."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    teks = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", TIME_FORMAT)
+    ringkas = logging.Formatter("%(asctime)s - %(message)s")
+
+    main_handler = TimedRotatingFileHandler(
+        LOG_FILE, when="midnight", backupCount=7, encoding="utf-8"
+    )
+    main_handler.setFormatter(JsonFormatter())
+    handlers = [
+        main_handler,
+        _file_handler(ERROR_LOG_FILE, teks, level=logging.ERROR),
+        _file_handler(MODERASI_LOG_FILE, ringkas, name="moderasi"),
+        _file_handler(STRIKE_LOG, ringkas, name="strike"),
+    ]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(
+            ColoredFormatter(
+                "%(log_color)s%(asctime)s - %(levelname)s - %(message)s",
+                datefmt=TIME_FORMAT,
+                log_colors={
+                    "DEBUG": "cyan",
+                    "INFO": "green",
+                    "WARNING": "yellow",
+                    "ERROR": "red",
+                    "CRITICAL": "bold_red",
+                },
+            )
+        )
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Tulis sisa antrean lalu hentikan thread listener."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def sampling_stats() -> dict:
+    for handler in logging.getLogger().handlers:
+        for f in handler.filters:
+            if isinstance(f, SamplingFilter):
+                return {"dibuang": f.dropped, "lokasi": len(f._sites)}
+    return {"dibuang": 0, "lokasi": 0}
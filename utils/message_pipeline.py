@@ -0,0 +1,160 @@
+# message_pipeline.py
+# Pipeline bertahap untuk setiap pesan teks grup: tahap berjalan berurutan,
+# berbagi satu view pesan (lower/normalisasi/link dihitung malas,
+# sekali saja), tiap tahap punya prefilter murah, dan pesan keluar sedini
+# mungkin. Tiap tahap dipecah jadi deteksi (sinkron, diukur sebagai waktu CPU
+# tahap) dan aksi (await ke Telegram/antrean outbound, diukur terpisah), jadi
+# latensi jaringan tidak tercampur dengan biaya deteksi.
+import time
+import logging
+from utils.moderation_tokenizer import normalize
+
+logger = logging.getLogger(__name__)
+
+STATS_LOG_EVERY = 5000  # ringkasan waktu per tahap di log setiap N pesan
+
+
+class MessageView:
+    """Satu pesan + turunan teks yang dihitung saat pertama kali dibutuhkan."""
+
+    __slots__ = ("msg", "text", "_lower", "_normalized", "_cache")
+
+    def __init__(self, msg):
+        self.msg = msg
+        self.text = msg.text or ""
+        self._lower = None
+        self._normalized = None
+        self._cache = {}
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def normalized(self) -> str:
+        """Teks hasil moderation_tokenizer.normalize (leet/homoglyph/spasi)."""
+        if self._normalized is None:
+            self._normalized = normalize(self.text)
+        return self._normalized
+
+    def memo(self, key: str, fn):
+        """Hasil `fn(self)` yang dihitung sekali per pesan (mis. daftar link)."""
+        if key not in self._cache:
+            self._cache[key] = fn(self)
+        return self._cache[key]
+
+    @property
+    def user_id(self):
+        return self.msg.from_user.id if self.msg.from_user else None
+
+    @property
+    def chat_id(self):
+        return self.msg.chat_id
+
+    @property
+    def is_reply_to_bot(self) -> bool:
+        reply = self.msg.reply_to_message
+        return bool(reply and reply.from_user and reply.from_user.is_bot)
+
+
+class Stage:
+    __slots__ = (
+        "name",
+        "detect",
+        "act",
+        "prefilter",
+        "calls",
+        "skipped",
+        "stops",
+        "ns",
+        "max_ns",
+        "acts",
+        "act_ns",
+        "act_max_ns",
+    )
+
+    def __init__(self, name: str, detect=None, act=None, prefilter=None):
+        self.name = name
+        # fn(view, ctx) -> hasil (sinkron); falsy = lanjut ke tahap berikutnya,
+        # None = prefilter saja sudah cukup sebagai deteksi
+        self.detect = detect
+        # async fn(view, update, ctx, hasil) -> True untuk berhenti
+        self.act = act
+        self.prefilter = prefilter  # fn(view) -> bool, None = selalu jalan
+        self.calls = 0
+        self.skipped = 0
+        self.stops = 0
+        self.ns = 0  # prefilter + deteksi
+        self.max_ns = 0
+        self.acts = 0
+        self.act_ns = 0  # aksi (API Telegram, antrean outbound)
+        self.act_max_ns = 0
+
+
+class MessagePipeline:
+    def __init__(self, stages: list):
+        self.stages = stages
+        self.messages = 0
+
+    async def run(self, update, ctx):
+        msg = update.message
+        if not msg or not msg.text:
+            return
+        view = MessageView(msg)
+        self.messages += 1
+        try:
+            for stage in self.stages:
+                mulai = time.perf_counter_ns()
+                try:
+                    # Prefilter ikut dihitung: di situlah pesan biasa berhenti
+                    if stage.prefilter is not None and not stage.prefilter(view):
+                        stage.skipped += 1
+                        continue
+                    stage.calls += 1
+                    hasil = stage.detect(view, ctx) if stage.detect else True
+                finally:
+                    lama = time.perf_counter_ns() - mulai
+                    stage.ns += lama
+                    stage.max_ns = max(stage.max_ns, lama)
+                if not hasil or stage.act is None:
+                    continue
+
+                stage.acts += 1
+                mulai = time.perf_counter_ns()
+                try:
+                    berhenti = await stage.act(view, update, ctx, hasil)
+                finally:
+                    lama = time.perf_counter_ns() - mulai
+                    stage.act_ns += lama
+                    stage.act_max_ns = max(stage.act_max_ns, lama)
+                if berhenti:
+                    stage.stops += 1
+                    return
+        finally:
+            if self.messages % STATS_LOG_EVERY == 0:
+                logger.info(f"⏱️ Pipeline pesan: {self.format_stats()}")
+
+    def stats(self) -> dict:
+        return {
+            stage.name: {
+                "jalan": stage.calls,
+                "lewat": stage.skipped,
+                "berhenti": stage.stops,
+                "total_ms": stage.ns / 1e6,
+                "rata2_us": stage.ns / 1e3 / max(stage.calls + stage.skipped, 1),
+                "maks_ms": stage.max_ns / 1e6,
+                "aksi": stage.acts,
+                "aksi_ms": stage.act_ns / 1e6,
+                "aksi_maks_ms": stage.act_max_ns / 1e6,
+            }
+            for stage in self.stages
+        }
+
+    def format_stats(self) -> str:
+        return ", ".join(
+            f"{nama} {s['total_ms']:.0f}ms/{s['jalan']}x "
+            f"(aksi {s['aksi_ms']:.0f}ms/{s['aksi']}x, stop {s['berhenti']})"
+            for nama, s in self.stats().items()
+        )
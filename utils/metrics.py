@@ -0,0 +1,261 @@
+# metrics.py
+# Instrumentasi ringan tanpa dependensi: counter & histogram berlabel di
+# memori, diekspor dalam format teks Prometheus lewat server HTTP lokal
+# (METRICS_PORT) dan diringkas untuk /stats. Biaya per observasi hanya
+# satu lookup dict + bisect.
+import os
+import time
+import asyncio
+import logging
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0 = server tidak dijalankan
+PREFIX = "azizah_"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_metrics = []
+_server = None
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names, values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class CounterMetric:
+    kind = "counter"
+
+    def __init__(self, name: str, help_: str, labels=()):
+        self.name = PREFIX + name
+        self.help = help_
+        self.labels = tuple(labels)
+        self.values = {}  # tuple label → nilai
+        _metrics.append(self)
+
+    def inc(self, *labels, n: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + n
+
+    def render(self):
+        for labels, value in self.values.items():
+            yield f"{self.name}{_label_str(self.labels, labels)} {value}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = PREFIX + name
+        self.help = help_
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}  # tuple label → [hitungan per bucket (+Inf), sum]
+        _metrics.append(self)
+
+    def observe(self, value: float, *labels):
+        data = self.values.get(labels)
+        if data is None:
+            data = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        data[0][bisect_left(self.buckets, value)] += 1
+        data[1] += value
+
+    def time(self, *labels):
+        return _Timer(self, labels)
+
+    def count(self, *labels) -> int:
+        data = self.values.get(labels)
+        return sum(data[0]) if data else 0
+
+    def quantile(self, q: float, *labels) -> float:
+        """Perkiraan kuantil dari bucket (interpolasi linear)."""
+        data = self.values.get(labels)
+        if not data:
+            return 0.0
+        counts = data[0]
+        target = q * sum(counts)
+        kumulatif = 0
+        bawah = 0.0
+        for i, n in enumerate(counts):
+            atas = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+            if n and kumulatif + n >= target:
+                return bawah + (atas - bawah) * (target - kumulatif) / n
+            kumulatif += n
+            bawah = atas
+        return bawah
+
+    def render(self):
+        le = [str(b) for b in self.buckets] + ["+Inf"]
+        for labels, (counts, total) in self.values.items():
+            kumulatif = 0
+            for batas, n in zip(le, counts):
+                kumulatif += n
+                lbl = _label_str(self.labels + ("le",), labels + (batas,))
+                yield f"{self.name}_bucket{lbl} {kumulatif}"
+            lbl = _label_str(self.labels, labels)
+            yield f"{self.name}_sum{lbl} {total}"
+            yield f"{self.name}_count{lbl} {kumulatif}"
+
+
+class _Timer:
+    __slots__ = ("hist", "labels", "mulai")
+
+    def __init__(self, hist, labels):
+        self.hist = hist
+        self.labels = labels
+
+    def __enter__(self):
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.mulai, *self.labels)
+        return False
+
+
+# === Metrik bersama ===
+HANDLER_SECONDS = Histogram(
+    "handler_seconds", "Latensi handler Telegram per command", ("handler",)
+)
+HANDLER_ERRORS = CounterMetric(
+    "handler_errors_total", "Exception tak tertangani per handler", ("handler",)
+)
+CACHE_LOOKUPS = CounterMetric(
+    "cache_lookups_total",
+    "Lookup cache per sumber (hit/stale/miss)",
+    ("cache", "hasil"),
+)
+HTTP_SECONDS = Histogram(
+    "http_request_seconds", "Latensi request upstream per host", ("host",)
+)
+HTTP_RESPONSES = CounterMetric(
+    "http_responses_total", "Respons upstream per host dan status", ("host", "status")
+)
+FEED_POLLS = CounterMetric(
+    "feed_polls_total", "Hasil polling feed monitor", ("feed", "status")
+)
+
+
+def cache_lookup(cache: str, hasil: str):
+    CACHE_LOOKUPS.inc(cache, hasil)
+
+
+# === Gauge dari subsistem lain (dibaca saat scrape, bukan di jalur panas) ===
+def _gauges():
+    from utils.outbound import outbound
+    from utils.rate_limiter import rate_limiter
+    from utils.persistence import STORES
+    from utils.logging_setup import sampling_stats
+
+    out = outbound.stats()
+    yield "outbound_queue", "Panggilan keluar dalam antrean", {}, out["antrean"]
+    yield "outbound_wait_max_seconds", "Tunggu antrean terlama", {}, out["tunggu_maks"]
+    for key, n in out.items():
+        if ":" in key or key in ("429", "retry"):
+            hasil, _, lane = key.partition(":")
+            labels = {"hasil": hasil, "lane": lane}
+            yield "outbound_calls", "Panggilan keluar", labels, n
+
+    rl = rate_limiter.stats()
+    for command, n in rl["allowed"].items():
+        labels = {"command": command}
+        yield "ratelimit_allowed", "Command diizinkan rate limiter", labels, n
+    for key, n in rl["throttled"].items():
+        scope, _, command = key.partition(":")
+        labels = {"scope": scope, "command": command}
+        yield "ratelimit_throttled", "Command ditahan rate limiter", labels, n
+    yield "ratelimit_buckets", "Token bucket aktif", {}, rl["buckets"]
+
+    for store in STORES:
+        labels = {"file": os.path.basename(store.path)}
+        yield "store_writes", "Penulisan file store", labels, store.writes
+        yield "store_pending", "Perubahan belum ditulis", labels, store.pending
+
+    dibuang = sampling_stats()["dibuang"]
+    yield "log_sampled_out", "Record log dibuang sampling", {}, dibuang
+
+    try:
+        from handlers.moderasi import PIPELINE
+    except Exception:
+        return
+    yield "pipeline_messages", "Pesan masuk pipeline moderasi", {}, PIPELINE.messages
+    for nama, s in PIPELINE.stats().items():
+        labels = {"stage": nama}
+        yield "pipeline_stage_runs", "Tahap dijalankan", labels, s["jalan"]
+        yield "pipeline_stage_skips", "Tahap dilewati prefilter", labels, s["lewat"]
+        yield "pipeline_stage_stops", "Pesan berhenti di tahap", labels, s["berhenti"]
+        deteksi_detik = s["total_ms"] / 1e3
+        yield "pipeline_stage_seconds", "Waktu deteksi tahap", labels, deteksi_detik
+        yield "pipeline_stage_actions", "Aksi tahap dijalankan", labels, s["aksi"]
+        aksi_detik = s["aksi_ms"] / 1e3
+        yield "pipeline_stage_action_seconds", "Waktu aksi tahap", labels, aksi_detik
+
+
+def render() -> str:
+    baris = []
+    for metric in _metrics:
+        baris.append(f"# HELP {metric.name} {metric.help}")
+        baris.append(f"# TYPE {metric.name} {metric.kind}")
+        baris.extend(metric.render())
+    # Satu blok per nama metrik (format Prometheus mensyaratkan berurutan)
+    gauges = {}
+    try:
+        for name, help_, labels, value in _gauges():
+            lbl = _label_str(tuple(labels), tuple(labels.values()))
+            gauges.setdefault(PREFIX + name, (help_, []))[1].append(f"{lbl} {value}")
+    except Exception:
+        logger.warning("⚠️ Gagal mengumpulkan gauge metrics", exc_info=True)
+    for name, (help_, nilai) in gauges.items():
+        baris.append(f"# HELP {name} {help_}")
+        baris.append(f"# TYPE {name} gauge")
+        baris.extend(name + v for v in nilai)
+    return "\n".join(baris) + "\n"
+
+
+# === Endpoint HTTP lokal ===
+async def _handle(reader, writer):
+    try:
+        request = await asyncio.wait_for(reader.readline(), timeout=5)
+        # Kosongkan header request
+        while (await asyncio.wait_for(reader.readline(), timeout=5)).strip():
+            pass
+        parts = request.decode("latin-1").split()
+        if len(parts) >= 2 and parts[1].split("?")[0] in ("/metrics", "/"):
+            status, body = "200 OK", render().encode("utf-8")
+            ctype = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            status, body, ctype = "404 Not Found", b"not found\n", "text/plain"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host: str = METRICS_HOST, port: int = METRICS_PORT):
+    """Jalankan endpoint /metrics (hanya jika METRICS_PORT diisi)."""
+    global _server
+    if not port or _server is not None:
+        return
+    _server = await asyncio.start_server(_handle, host, port)
+    logger.info(f"📈 Endpoint metrics aktif di http://{host}:{port}/metrics")
+
+
+async def stop_server():
+    global _server
+    if _server is not None:
+        _server.close()
+        await _server.wait_closed()
+        _server = None
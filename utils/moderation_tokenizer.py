@@ -0,0 +1,139 @@
+# moderation_tokenizer.py
+# Normalisasi pesan untuk moderasi: homoglyph/leet → huruf biasa, huruf yang
+# dispasi ("s l o t") digabung, lalu kata kunci dicocokkan per token utuh
+# (jadi "ras" tidak lagi kena di "keras", "cuk" tidak kena di "cukup").
+import re
+import unicodedata
+from utils.keyword_matcher import KeywordMatcher
+
+# Huruf Kiril/Yunani yang mirip huruf Latin (setelah lower())
+HOMOGLYPH_FROM = "авеёкмнорстухіјѕԁɡαβεικνορτυ"
+HOMOGLYPH_TO = "abeekmhopctyxijsdgabeikvoptu"
+ZERO_WIDTH = "\u200b\u200c\u200d\u2060\ufeff\u00ad"
+
+NORMALIZE_TABLE = str.maketrans(HOMOGLYPH_FROM, HOMOGLYPH_TO, ZERO_WIDTH)
+# Leet hanya diterapkan pada token campuran huruf + angka/simbol ("j4d1"),
+# supaya angka murni ("2024", "10") tetap angka.
+LEET_TABLE = str.maketrans("013456789@$", "oieasgtbgas")
+LEET_CHARS = frozenset("013456789@$")
+
+TOKEN_RE = re.compile(r"(?:[^\W_]|[*@$])+")
+REPEAT_RE = re.compile(r"([^\W\d_])\1{2,}")  # "anjiiiing" → "anjing"
+
+MIN_SPACED_RUN = 3  # "s l o t" → "slot"; "a b" dibiarkan
+MASK = "*"
+
+
+def _fold_unicode(text: str) -> str:
+    # Huruf tebal/fullwidth (𝐬𝐥𝐨𝐭, ｓｌｏｔ) dan diakritik → ASCII dasar
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> list:
+    """Token ter-normalisasi dari pesan mentah.
+
+    Token campuran huruf/angka diganti satu bentuk leet-nya ("slot88" →
+    "slotbb"), tanpa dipotong di batas huruf↔angka: potongan seperti "ras" dari
+    "b3ras" akan memunculkan lagi false positive substring.
+    """
+    text = text.lower()
+    if not text.isascii():
+        text = _fold_unicode(text)
+    text = text.translate(NORMALIZE_TABLE)
+    if REPEAT_RE.search(text):
+        text = REPEAT_RE.sub(r"\1", text)
+
+    tokens = []
+    run = []  # token satu huruf berurutan
+
+    for tok in TOKEN_RE.findall(text):
+        if len(tok) == 1 and (tok.isalpha() or tok == MASK):
+            run.append(tok)
+            continue
+        if run:
+            _flush_run(run, tokens)
+        if not tok.isalpha() and not tok.isdigit() and _has_alpha(tok):
+            if LEET_CHARS.intersection(tok):
+                tok = tok.translate(LEET_TABLE)
+        tokens.append(tok)
+
+    if run:
+        _flush_run(run, tokens)
+    return tokens
+
+
+def _has_alpha(tok: str) -> bool:
+    for ch in tok:
+        if ch.isalpha():
+            return True
+    return False
+
+
+def _flush_run(run: list, tokens: list):
+    if len(run) >= MIN_SPACED_RUN:
+        tokens.append("".join(run))
+    else:
+        tokens.extend(run)
+    run.clear()
+
+
+def normalize(text: str) -> str:
+    """Token digabung spasi, diapit spasi agar bisa dicocokkan per kata utuh."""
+    return " " + " ".join(tokenize(text)) + " "
+
+
+class ModerationMatcher:
+    """Pencocok kata kunci moderasi per token utuh.
+
+    `kata` cocok hanya sebagai token utuh; `kata*` cocok sebagai awalan token
+    ("judi*" kena di "judionline"). Token yang disensor ("j*di", "anj*ng")
+    dicocokkan posisi demi posisi dengan kata kunci sepanjang token itu.
+    """
+
+    __slots__ = ("_automaton", "_by_length", "categories")
+
+    def __init__(self, categories: dict):
+        self.categories = tuple(categories)
+        patterns = {}
+        by_length = {}
+        for kategori, kata_list in categories.items():
+            pola = patterns.setdefault(kategori, [])
+            for kata in kata_list:
+                kata = kata.strip().lower()
+                prefix = kata.endswith(MASK)
+                kata = " ".join(tokenize(kata.rstrip(MASK)))
+                if not kata:
+                    continue
+                pola.append(" " + kata + ("" if prefix else " "))
+                if " " not in kata and not prefix:
+                    by_length.setdefault(len(kata), []).append((kategori, kata))
+        self._automaton = KeywordMatcher(patterns)
+        self._by_length = by_length
+
+    def _masked(self, token: str, hits: set):
+        known = len(token) - token.count(MASK)
+        # Minimal separuh huruf terlihat, supaya "****" tidak cocok dengan apa pun
+        if known < 2 or known * 2 < len(token):
+            return
+        for kategori, kata in self._by_length.get(len(token), ()):
+            if kategori in hits:
+                continue
+            for t, k in zip(token, kata):
+                if t != MASK and t != k:
+                    break
+            else:
+                hits.add(kategori)
+
+    def find(self, text: str) -> set:
+        """Kategori yang kata kuncinya muncul di pesan mentah `text`."""
+        return self.find_normalized(normalize(text))
+
+    def find_normalized(self, view: str) -> set:
+        """Seperti find, untuk teks yang sudah melewati normalize()."""
+        hits = self._automaton.find(view)
+        if MASK in view and len(hits) < len(self.categories):
+            for token in view.split():
+                if MASK in token:
+                    self._masked(token, hits)
+        return hits
@@ -0,0 +1,262 @@
+# outbound.py
+# Antrean keluar terpusat untuk panggilan Bot API: jalur prioritas
+# (moderasi > balasan > info), pacing per chat + global dengan token bucket,
+# dan penanganan 429 RetryAfter tanpa membuang pesan.
+import time
+import heapq
+import asyncio
+import logging
+from collections import Counter
+from telegram.error import RetryAfter, TimedOut, NetworkError
+from utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Jalur prioritas (angka kecil didahulukan)
+LANE_MODERASI = 0  # hapus, ban, mute, restrict
+LANE_BALASAN = 1  # sambutan, peringatan, digest
+LANE_INFO = 2  # broadcast pengumuman / monitoring
+LANE_NAMES = {LANE_MODERASI: "moderasi", LANE_BALASAN: "balasan", LANE_INFO: "info"}
+
+# (kapasitas, detik per token) — batas Telegram ±30 pesan/detik global,
+# ±20 pesan/menit per grup, ±1 pesan/detik per chat pribadi
+GLOBAL_BUCKET = (25, 1 / 25)
+GROUP_BUCKET = (3, 3.0)
+PRIVATE_BUCKET = (3, 1.0)
+
+MAX_INFLIGHT = 8
+MAX_ATTEMPTS = 5  # untuk error jaringan; RetryAfter selalu dicoba ulang
+IDLE_PRUNE = 10 * 60
+
+
+def _detik(retry_after) -> float:
+    # PTB lama memberi int, versi baru bisa timedelta
+    if hasattr(retry_after, "total_seconds"):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "chat_id", "lane", "kirim", "future", "seq")
+
+    def __init__(self, fn, args, kwargs, chat_id, lane, kirim, future):
+        self.seq = 0
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.chat_id = chat_id
+        self.lane = lane
+        self.kirim = kirim
+        self.future = future
+
+
+class OutboundScheduler:
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self._wakeup = None
+        self._dispatcher = None
+        self._inflight = None
+        self._tasks = set()
+        self._global = None
+        self._chats = {}  # chat_id → TokenBucket
+        self._paused = {}  # chat_id (None = global) → monotonic sampai kapan
+        self._busy = set()  # chat dengan pesan yang sedang dikirim (jaga urutan)
+        self.metrics = Counter()
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    # === API ===
+    def submit(self, fn, *args, chat_id=None, lane=LANE_BALASAN, kirim=True, **kw):
+        """Antrekan panggilan `fn(*args, **kw)`; mengembalikan Future hasilnya.
+
+        `chat_id` di sini hanya kunci pacing dan tidak diteruskan ke `fn`,
+        jadi chat tujuan tetap harus ada di `args`/`kw` milik `fn`.
+
+        `kirim=False` untuk aksi yang bukan pesan (hapus/ban/restrict): hanya
+        dibatasi bucket global, tidak memakai jatah pesan per chat.
+        """
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._inflight = asyncio.Semaphore(MAX_INFLIGHT)
+            self._global = TokenBucket(*GLOBAL_BUCKET, time.monotonic())
+            self._dispatcher = loop.create_task(self._dispatch())
+        job = _Job(fn, args, kw, chat_id, lane, kirim, loop.create_future())
+        self._seq += 1
+        job.seq = self._seq
+        self._push(job, time.monotonic())
+        self.metrics[f"antre:{LANE_NAMES[lane]}"] += 1
+        return job.future
+
+    async def send(self, fn, *args, **kw):
+        """Seperti submit, tetapi menunggu hasil (atau exception) panggilan."""
+        return await self.submit(fn, *args, **kw)
+
+    def stats(self) -> dict:
+        terkirim = sum(n for k, n in self.metrics.items() if k.startswith("ok:"))
+        return {
+            **dict(self.metrics),
+            "antrean": len(self._heap),
+            "tunggu_rata2": self.wait_total / terkirim if terkirim else 0.0,
+            "tunggu_maks": self.wait_max,
+        }
+
+    async def close(self, timeout: float = 5.0):
+        """Beri waktu antrean habis, lalu hentikan dispatcher."""
+        if self._dispatcher is None:
+            return
+        batas = time.monotonic() + timeout
+        while (self._heap or self._tasks) and time.monotonic() < batas:
+            await asyncio.sleep(0.1)
+        if self._heap:
+            logger.warning(f"⚠️ {len(self._heap)} panggilan keluar belum terkirim")
+        self._dispatcher.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        self._dispatcher = None
+
+    # === Internal ===
+    def _push(self, job, queued_at):
+        # Urutan asli (seq) dipertahankan juga saat job diantrekan ulang
+        heapq.heappush(self._heap, (job.lane, job.seq, queued_at, job))
+        self._wakeup.set()
+
+    def _chat_bucket(self, chat_id, now):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            # ID grup negatif; "@username" hanya untuk grup/kanal publik
+            grup = str(chat_id).startswith(("-", "@"))
+            spec = GROUP_BUCKET if grup else PRIVATE_BUCKET
+            bucket = self._chats[chat_id] = TokenBucket(*spec, now)
+        return bucket
+
+    def _ready_in(self, job, now) -> float:
+        """Detik sampai job boleh jalan (0 = sekarang, inf = tunggu chat selesai)."""
+        if job.kirim and job.chat_id in self._busy:
+            return float("inf")
+        tunggu = max(
+            self._paused.get(None, 0) - now,
+            self._global.retry_after(1, now),
+        )
+        if job.chat_id is not None:
+            tunggu = max(tunggu, self._paused.get(job.chat_id, 0) - now)
+            if job.kirim:
+                tunggu = max(
+                    tunggu, self._chat_bucket(job.chat_id, now).retry_after(1, now)
+                )
+        return max(tunggu, 0.0)
+
+    def _pick(self, now):
+        """Job prioritas tertinggi yang chat-nya siap; (entry, jeda_minimum)."""
+        ditunda = []
+        dipilih = None
+        jeda = float("inf")
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            tunggu = self._ready_in(entry[3], now)
+            if tunggu <= 0:
+                dipilih = entry
+                break
+            jeda = min(jeda, tunggu)
+            ditunda.append(entry)
+        for entry in ditunda:
+            heapq.heappush(self._heap, entry)
+        return dipilih, jeda
+
+    def _prune(self, now):
+        for chat_id, bucket in list(self._chats.items()):
+            if now - bucket.updated > IDLE_PRUNE and bucket.penuh(now):
+                del self._chats[chat_id]
+        for key, until in list(self._paused.items()):
+            if until <= now:
+                del self._paused[key]
+
+    async def _dispatch(self):
+        dikirim = 0
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            await self._inflight.acquire()
+            now = time.monotonic()
+            entry, jeda = self._pick(now)
+            if entry is None:
+                self._inflight.release()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=None if jeda == float("inf") else jeda,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, queued_at, job = entry
+            self._global.take(1)
+            if job.chat_id is not None and job.kirim:
+                self._chat_bucket(job.chat_id, now).take(1)
+                self._busy.add(job.chat_id)
+
+            tunggu = now - queued_at
+            self.wait_max = max(self.wait_max, tunggu)
+            task = asyncio.get_running_loop().create_task(
+                self._execute(job, queued_at, tunggu)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+            dikirim += 1
+            if dikirim % 500 == 0:
+                self._prune(now)
+
+    async def _execute(self, job, queued_at, tunggu):
+        lane = LANE_NAMES[job.lane]
+        attempts = 0
+        try:
+            while True:
+                try:
+                    hasil = await job.fn(*job.args, **job.kwargs)
+                except RetryAfter as e:
+                    detik = _detik(e.retry_after)
+                    self.metrics["429"] += 1
+                    self._paused[job.chat_id] = time.monotonic() + detik
+                    logger.warning(
+                        f"⏳ Flood limit ({lane}, chat {job.chat_id}), tunggu {detik}s"
+                    )
+                    # Kembali ke antrean dengan urutan semula, tunggu jeda di dispatcher
+                    self._push(job, queued_at)
+                    return
+                except (TimedOut, NetworkError) as e:
+                    attempts += 1
+                    if attempts >= MAX_ATTEMPTS:
+                        raise
+                    self.metrics["retry"] += 1
+                    logger.warning(f"🔁 Panggilan {lane} gagal ({e}), coba lagi")
+                    await asyncio.sleep(min(2**attempts, 30))
+                    continue
+                break
+        except Exception as e:
+            self.metrics[f"gagal:{lane}"] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+                # Hindari "exception was never retrieved" untuk submit tanpa await
+                job.future.exception()
+            nama = getattr(job.fn, "__name__", job.fn)
+            logger.error(f"❌ Panggilan keluar {nama} ({lane}) gagal: {e}")
+        else:
+            self.metrics[f"ok:{lane}"] += 1
+            self.wait_total += tunggu
+            if not job.future.done():
+                job.future.set_result(hasil)
+        finally:
+            if job.kirim:
+                self._busy.discard(job.chat_id)
+                self._wakeup.set()
+            self._inflight.release()
+
+
+outbound = OutboundScheduler()
@@ -0,0 +1,117 @@
+# persistence.py
+# Penyimpanan set JSON bersama dengan write-behind: perubahan dikumpulkan di
+# memori dan ditulis sekali per interval (atau setelah N perubahan), lewat file
+# sementara + os.replace agar file tidak pernah setengah tertulis.
+import os
+import json
+import logging
+import tempfile
+from utils.constants import BANNED_FILE, PHISHING_CACHE_FILE
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 30  # detik, dipakai job flush di bot.py
+FLUSH_THRESHOLD = 50  # perubahan tertunda sebelum ditulis tanpa menunggu job
+
+
+def atomic_write_json(path: str, data, **dump_kwargs):
+    """Tulis JSON ke file sementara di folder yang sama lalu ganti atomik."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class JsonSetStore:
+    """Set in-memory yang menjadi satu-satunya sumber kebenaran untuk satu file."""
+
+    def __init__(self, path: str, threshold: int = FLUSH_THRESHOLD, indent=None):
+        self.path = path
+        self.threshold = threshold
+        self.indent = indent
+        self.pending = 0
+        self.writes = 0
+        self._items = self._load()
+
+    def _load(self) -> set:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return set(json.load(f))
+        except FileNotFoundError:
+            return set()
+        except (json.JSONDecodeError, OSError, TypeError):
+            logger.warning(f"⚠️ Gagal memuat {self.path}, mulai kosong", exc_info=True)
+            return set()
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def _changed(self):
+        self.pending += 1
+        if self.pending >= self.threshold:
+            self.flush()
+
+    def add(self, item):
+        if item not in self._items:
+            self._items.add(item)
+            self._changed()
+
+    def discard(self, item):
+        if item in self._items:
+            self._items.discard(item)
+            self._changed()
+
+    def clear(self):
+        if self._items:
+            self._items.clear()
+            self._changed()
+
+    def flush(self):
+        """Tulis ke disk jika ada perubahan tertunda."""
+        if not self.pending:
+            return
+        try:
+            atomic_write_json(
+                self.path, sorted(self._items, key=str), indent=self.indent
+            )
+        except Exception:
+            # Perubahan tetap tertunda → dicoba lagi pada flush berikutnya
+            logger.error(f"❌ Gagal menulis {self.path}", exc_info=True)
+            return
+        logger.debug(f"💾 {self.path}: {self.pending} perubahan ditulis")
+        self.pending = 0
+        self.writes += 1
+
+
+banned_users = JsonSetStore(BANNED_FILE)
+phishing_cache = JsonSetStore(PHISHING_CACHE_FILE, indent=2)
+
+STORES = [banned_users, phishing_cache]
+
+
+def register_store(store):
+    """Ikutkan store lain (dengan .flush()) ke job flush berkala dan shutdown."""
+    STORES.append(store)
+    return store
+
+
+def flush_all():
+    for store in STORES:
+        store.flush()
@@ -0,0 +1,107 @@
+# poll_scheduler.py
+# Interval polling adaptif untuk monitor feed: cepat saat ada item baru,
+# backoff eksponensial saat sepi, dengan batas atas yang dipelajari dari pola
+# jam posting (updated_at) di get_info.json / get_prelim.json.
+import json
+import logging
+from datetime import datetime, timedelta
+from utils.constants import PENGUMUMAN_FILE, PRELIM_FILE
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL = 20  # detik, saat feed sedang aktif (mis. hari pengumuman)
+BASE_INTERVAL = 60
+MAX_INTERVAL = 30 * 60  # batas atas di jam yang historisnya tidak pernah ada posting
+INACTIVE_INTERVAL = 30 * 60  # di luar is_waktu_aktif
+HOT_WINDOW = timedelta(minutes=20)  # tetap cepat selama ini setelah item baru
+
+HISTORY_FILES = (PENGUMUMAN_FILE, PRELIM_FILE)
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Prior ringan untuk jam kerja (Sen–Jum 08–17) agar tetap masuk akal saat riwayat
+# masih sedikit
+PRIOR_WORK_HOURS = 0.5
+
+
+def _hour_of_week(dt: datetime) -> int:
+    return dt.weekday() * 24 + dt.hour
+
+
+class AdaptivePoller:
+    def __init__(self):
+        self.interval = BASE_INTERVAL
+        self.hot_until = None
+        self.week = [0.0] * 168
+        self.day = [0.0] * 24
+        for how in range(168):
+            hari, jam = divmod(how, 24)
+            if hari < 5 and 8 <= jam < 17:
+                self.week[how] += PRIOR_WORK_HOURS
+                self.day[jam] += PRIOR_WORK_HOURS / 5
+
+    def learn(self, dt: datetime, bobot: float = 1.0):
+        self.week[_hour_of_week(dt)] += bobot
+        self.day[dt.hour] += bobot
+
+    def load_history(self, paths=HISTORY_FILES):
+        jumlah = 0
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    items = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            for item in items:
+                try:
+                    self.learn(datetime.strptime(item["updated_at"], TIME_FORMAT))
+                    jumlah += 1
+                except (KeyError, TypeError, ValueError):
+                    continue
+        logger.info(f"📈 Pola jam posting dipelajari dari {jumlah} item")
+
+    def activity(self, now: datetime) -> float:
+        """Aktivitas relatif 0..1 untuk jam ini (dihaluskan ±1 jam)."""
+        how = _hour_of_week(now)
+        week = sum(self.week[(how + d) % 168] for d in (-1, 0, 1))
+        day = sum(self.day[(now.hour + d) % 24] for d in (-1, 0, 1))
+        puncak_week = max(
+            sum(self.week[(h + d) % 168] for d in (-1, 0, 1)) for h in range(168)
+        )
+        puncak_day = max(
+            sum(self.day[(h + d) % 24] for d in (-1, 0, 1)) for h in range(24)
+        )
+        # Pola per jam-minggu lebih tajam, per jam-hari lebih stabil → gabungkan
+        return 0.5 * week / puncak_week + 0.5 * day / puncak_day
+
+    def next_interval(self, item_baru: int, aktif: bool, now: datetime = None) -> float:
+        """Interval (detik) sampai polling berikutnya."""
+        now = now or datetime.now()
+        if not aktif:
+            self.interval = BASE_INTERVAL
+            return INACTIVE_INTERVAL
+
+        if item_baru:
+            self.learn(now, item_baru)
+            self.hot_until = now + HOT_WINDOW
+            self.interval = MIN_INTERVAL
+        elif self.hot_until and now < self.hot_until:
+            self.interval = MIN_INTERVAL
+        else:
+            # Backoff eksponensial, dibatasi sesuai aktivitas historis jam ini:
+            # aktivitas 1 → BASE_INTERVAL, 0 → MAX_INTERVAL (skala geometris)
+            aktivitas = self.activity(now)
+            batas = BASE_INTERVAL * (MAX_INTERVAL / BASE_INTERVAL) ** (
+                (1 - aktivitas) ** 2
+            )
+            # Jangan tidur melewati awal jam berikutnya yang lebih ramai
+            jam_berikut = now.replace(minute=0, second=0, microsecond=0) + timedelta(
+                hours=1
+            )
+            if self.activity(jam_berikut) > aktivitas:
+                sisa = (jam_berikut - now).total_seconds()
+                batas = min(batas, max(sisa, BASE_INTERVAL))
+            self.interval = min(max(self.interval * 2, BASE_INTERVAL), batas)
+        return self.interval
+
+
+poller = AdaptivePoller()
+poller.load_history()
@@ -0,0 +1,174 @@
+# raid_detector.py
+# Deteksi banjir member baru / pesan per chat (sliding window). Saat raid,
+# chat masuk mode terdegradasi: sambutan digabung jadi satu digest, member
+# baru dibatasi, aksi ban/hapus diantrekan di outbound tanpa ditunggu, dan
+# admin menerima satu ringkasan ketika raid selesai.
+import time
+import logging
+from collections import deque, Counter
+from utils.outbound import outbound, LANE_MODERASI, LANE_BALASAN
+
+logger = logging.getLogger(__name__)
+
+JOIN_WINDOW = 60  # detik
+JOIN_THRESHOLD = 8  # member baru dalam JOIN_WINDOW → raid
+MSG_WINDOW = 10
+MSG_THRESHOLD = 40  # pesan dalam MSG_WINDOW → raid
+RAID_COOLDOWN = 5 * 60  # raid selesai setelah sekian detik tanpa lonjakan
+
+RESTRICT_DURATION = 30 * 60  # member baru saat raid tidak bisa kirim pesan
+DIGEST_MAX_MENTIONS = 20
+
+
+class SlidingWindow:
+    """Jumlah kejadian dalam `window` detik terakhir."""
+
+    __slots__ = ("window", "_events")
+
+    def __init__(self, window: float):
+        self.window = window
+        self._events = deque()
+
+    def hit(self, now: float, n: int = 1) -> int:
+        self._events.extend([now] * n)
+        return self.count(now)
+
+    def count(self, now: float) -> int:
+        batas = now - self.window
+        events = self._events
+        while events and events[0] <= batas:
+            events.popleft()
+        return len(events)
+
+
+class ChatState:
+    __slots__ = ("joins", "messages", "started", "last_trip", "digest", "stats")
+
+    def __init__(self):
+        self.joins = SlidingWindow(JOIN_WINDOW)
+        self.messages = SlidingWindow(MSG_WINDOW)
+        self.started = None  # monotonic saat raid mulai, None = normal
+        self.last_trip = 0.0
+        self.digest = []  # mention member baru yang belum disambut
+        self.stats = Counter()
+
+
+class RaidDetector:
+    def __init__(self):
+        self._chats = {}
+
+    def _state(self, chat_id) -> ChatState:
+        state = self._chats.get(chat_id)
+        if state is None:
+            state = self._chats[chat_id] = ChatState()
+        return state
+
+    def _trip(self, chat_id, state: ChatState, now: float, sebab: str):
+        state.last_trip = now
+        if state.started is None:
+            state.started = now
+            state.stats.clear()
+            logger.warning(f"🚨 Raid terdeteksi di {chat_id} ({sebab}), mode raid")
+
+    def is_active(self, chat_id) -> bool:
+        state = self._chats.get(chat_id)
+        return state is not None and state.started is not None
+
+    def record_join(self, chat_id, n: int = 1) -> bool:
+        """Catat member baru; True jika chat (sekarang) dalam mode raid."""
+        state = self._state(chat_id)
+        now = time.monotonic()
+        jumlah = state.joins.hit(now, n)
+        if jumlah >= JOIN_THRESHOLD:
+            self._trip(chat_id, state, now, "lonjakan member baru")
+        if state.started is None:
+            return False
+        # Saat raid baru mulai, hitung juga member yang masuk di window pemicu
+        state.stats["join"] += jumlah if state.started == now else n
+        return True
+
+    def record_message(self, chat_id) -> bool:
+        state = self._state(chat_id)
+        now = time.monotonic()
+        if state.messages.hit(now) >= MSG_THRESHOLD:
+            self._trip(chat_id, state, now, "lonjakan pesan")
+        return state.started is not None
+
+    def add_digest(self, chat_id, mention: str):
+        self._state(chat_id).digest.append(mention)
+
+    def pop_digests(self):
+        """[(chat_id, [mention...])] yang menunggu disambut."""
+        hasil = []
+        for chat_id, state in self._chats.items():
+            if state.digest:
+                hasil.append((chat_id, state.digest))
+                state.digest = []
+        return hasil
+
+    def pop_ended(self):
+        """Akhiri raid yang sudah tenang; [(chat_id, durasi_detik, stats)]."""
+        now = time.monotonic()
+        hasil = []
+        for chat_id, state in list(self._chats.items()):
+            if state.started is not None and now - state.last_trip >= RAID_COOLDOWN:
+                hasil.append((chat_id, now - state.started, dict(state.stats)))
+                state.started = None
+                logger.warning(f"✅ Mode raid di {chat_id} selesai: {hasil[-1][2]}")
+            elif (
+                state.started is None
+                and not state.digest
+                and not state.joins.count(now)
+                and not state.messages.count(now)
+            ):
+                del self._chats[chat_id]
+        return hasil
+
+    async def run(self, chat_id, kind: str, fn, *args, **kwargs):
+        """Jalankan aksi moderasi lewat outbound.
+
+        Di luar raid, aksi ("hapus", "ban", "mute", "restrict") ditunggu
+        hasilnya. Selama raid, aksi hanya diantrekan dan dicatat untuk
+        ringkasan. "notice" (peringatan ke grup) tidak pernah ditunggu agar
+        handler tidak tertahan pacing per chat, dan dibuang selama raid.
+        """
+        state = self._chats.get(chat_id)
+        raid = state is not None and state.started is not None
+        if raid:
+            state.stats[kind] += 1
+        if kind == "notice":
+            if not raid:
+                outbound.submit(fn, *args, chat_id=chat_id, lane=LANE_BALASAN, **kwargs)
+            return None
+        future = outbound.submit(
+            fn, *args, chat_id=chat_id, lane=LANE_MODERASI, kirim=False, **kwargs
+        )
+        if not raid:
+            return await future
+
+
+def format_digest(mentions: list) -> str:
+    tampil = ", ".join(mentions[:DIGEST_MAX_MENTIONS])
+    sisa = len(mentions) - DIGEST_MAX_MENTIONS
+    if sisa > 0:
+        tampil += f" dan {sisa} lainnya"
+    return (
+        f"👋 Selamat datang {tampil}!\n\n"
+        "🛡️ Grup sedang dalam mode pengamanan, member baru dibatasi sementara. "
+        "Baca /rules sambil menunggu ya."
+    )
+
+
+def format_summary(durasi: float, stats: dict) -> str:
+    return (
+        "🛡️ <b>Mode raid selesai</b>\n"
+        f"⏱️ Durasi: {max(1, round(durasi / 60))} menit\n"
+        f"👥 Member baru: {stats.get('join', 0)} "
+        f"(dibatasi {stats.get('restrict', 0)})\n"
+        f"🚫 Ban: {stats.get('ban', 0)} • 🔇 Mute: {stats.get('mute', 0)}\n"
+        f"🧹 Pesan dihapus: {stats.get('hapus', 0)} • "
+        f"🔕 Peringatan ditahan: {stats.get('notice', 0)}"
+    )
+
+
+raid_detector = RaidDetector()
@@ -0,0 +1,138 @@
+# rate_limiter.py
+# Token bucket per user, per chat, dan per kelas command (pengganti cooldown global).
+import time
+from collections import Counter
+
+# (kapasitas token, detik per 1 token)
+USER_BUCKET = (3, 10.0)  # burst 3 command, lalu 1 command / 10 detik per user
+CHAT_BUCKET = (20, 1.0)  # lindungi grup dari banjir command gabungan
+CLASS_BUCKETS = {
+    # Command berat menyentuh Chrome / Meta AI → dibatasi secara global,
+    # minimal setara cooldown global lama (1 command / 10 detik)
+    "berat": (6, 10.0),
+    "ringan": (30, 0.5),
+}
+
+# Biaya token per command (default 1); naikkan untuk membuat command lebih mahal
+# tanpa mengubah ukuran bucket
+COMMAND_COST = {"cek": 1, "tanya": 1, "cek_eps": 1}
+# Kelas per command (default "ringan")
+COMMAND_CLASS = {"cek": "berat", "tanya": "berat", "cek_eps": "berat"}
+# Command yang token kelasnya baru diambil handler saat benar-benar ke upstream
+# (cache miss) lewat take_class(), bukan di wrapper
+UPSTREAM_ONLY = {"cek"}
+
+IDLE_PRUNE = 15 * 60  # bucket penuh yang tak tersentuh selama ini dibuang
+PRUNE_EVERY = 500  # cek prune setiap N panggilan
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "interval", "tokens", "updated")
+
+    def __init__(self, capacity: float, interval: float, now: float):
+        self.capacity = capacity
+        self.interval = interval
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def _isi(self, now: float):
+        if now > self.updated:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) / self.interval
+            )
+            self.updated = now
+
+    def retry_after(self, cost: float, now: float) -> float:
+        """Detik sampai `cost` token tersedia (0 jika sudah cukup)."""
+        self._isi(now)
+        kurang = cost - self.tokens
+        return 0.0 if kurang <= 0 else kurang * self.interval
+
+    def take(self, cost: float):
+        self.tokens -= cost
+
+    def penuh(self, now: float) -> bool:
+        self._isi(now)
+        return self.tokens >= self.capacity
+
+
+class RateLimiter:
+    def __init__(self):
+        self._buckets = {}
+        self._calls = 0
+        self.allowed = Counter()  # command → diizinkan
+        self.throttled = Counter()  # (scope, command) → ditolak
+
+    def _bucket(self, key, spec, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(spec[0], spec[1], now)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _prune(self, now):
+        basi = [
+            key
+            for key, b in self._buckets.items()
+            if now - b.updated > IDLE_PRUNE and b.penuh(now)
+        ]
+        for key in basi:
+            del self._buckets[key]
+
+    def check(self, user_id: int, chat_id: int, command: str):
+        """Ambil token dari semua bucket terkait, atau tidak sama sekali.
+
+        Mengembalikan (diizinkan, retry_after_detik, scope_penolak).
+        """
+        now = time.monotonic()
+        self._calls += 1
+        if self._calls % PRUNE_EVERY == 0:
+            self._prune(now)
+
+        cost = COMMAND_COST.get(command, 1)
+        buckets = [
+            ("user", self._bucket(("user", user_id), USER_BUCKET, now)),
+            ("chat", self._bucket(("chat", chat_id), CHAT_BUCKET, now)),
+        ]
+        if command not in UPSTREAM_ONLY:
+            kelas = COMMAND_CLASS.get(command, "ringan")
+            buckets.append(
+                (kelas, self._bucket(("class", kelas), CLASS_BUCKETS[kelas], now))
+            )
+
+        for scope, bucket in buckets:
+            tunggu = bucket.retry_after(cost, now)
+            if tunggu > 0:
+                self.throttled[(scope, command)] += 1
+                return False, tunggu, scope
+
+        for _, bucket in buckets:
+            bucket.take(cost)
+        self.allowed[command] += 1
+        return True, 0.0, None
+
+    def take_class(self, command: str):
+        """Ambil token kelas untuk command UPSTREAM_ONLY (saat cache miss).
+
+        Mengembalikan (diizinkan, retry_after_detik).
+        """
+        now = time.monotonic()
+        cost = COMMAND_COST.get(command, 1)
+        kelas = COMMAND_CLASS.get(command, "ringan")
+        bucket = self._bucket(("class", kelas), CLASS_BUCKETS[kelas], now)
+        tunggu = bucket.retry_after(cost, now)
+        if tunggu > 0:
+            self.throttled[(kelas, command)] += 1
+            return False, tunggu
+        bucket.take(cost)
+        return True, 0.0
+
+    def stats(self) -> dict:
+        return {
+            "allowed": dict(self.allowed),
+            "throttled": {f"{s}:{c}": n for (s, c), n in self.throttled.items()},
+            "buckets": len(self._buckets),
+        }
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,92 @@
+# seen_ids.py
+# Himpunan ID pengumuman yang sudah pernah dilihat, sebagai bitmap (1 bit per
+# ID mulai dari `base`): cek keanggotaan O(1), tambah murah, dan riwayat tidak
+# dibatasi 10 ID terakhir. Format lama {"last_ids": [...]} dimigrasi otomatis.
+import json
+import base64
+import logging
+from utils.persistence import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class SeenIdStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.base = None  # ID terkecil yang bisa disimpan (kelipatan 8)
+        self.bits = bytearray()
+        self.count = 0
+        self.max_id = None
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError):
+            logger.warning(f"⚠️ Gagal memuat {self.path}, mulai kosong")
+            return
+
+        if "bitmap" in data:
+            self.base = data["base"]
+            self.bits = bytearray(base64.b64decode(data["bitmap"]))
+            self.count = sum(bin(b).count("1") for b in self.bits)
+            self.max_id = data.get("max_id")
+        elif "last_ids" in data:
+            self.add_many(data["last_ids"])
+            logger.info(f"📦 Migrasi {self.count} ID lama (last_ids): {self.path}")
+
+    def __contains__(self, id_) -> bool:
+        try:
+            offset = int(id_) - self.base
+        except (TypeError, ValueError):
+            return False
+        if offset < 0 or offset >= len(self.bits) * 8:
+            return False
+        return bool(self.bits[offset >> 3] & (1 << (offset & 7)))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, id_):
+        id_ = int(id_)
+        if self.base is None:
+            self.base = id_ - (id_ % 8)
+        if id_ < self.base:
+            # Perlu bit di depan: geser base turun (jarang, ID umumnya naik)
+            baru = id_ - (id_ % 8)
+            self.bits[:0] = bytes((self.base - baru) // 8)
+            self.base = baru
+        offset = id_ - self.base
+        byte = offset >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte - len(self.bits) + 1))
+        mask = 1 << (offset & 7)
+        if not self.bits[byte] & mask:
+            self.bits[byte] |= mask
+            self.count += 1
+            self.max_id = id_ if self.max_id is None else max(self.max_id, id_)
+            self.dirty = True
+
+    def add_many(self, ids):
+        for id_ in ids:
+            if id_ is not None:
+                self.add(id_)
+
+    def save(self):
+        if not self.dirty:
+            return
+        atomic_write_json(
+            self.path,
+            {
+                "base": self.base,
+                "max_id": self.max_id,
+                "count": self.count,
+                "bitmap": base64.b64encode(bytes(self.bits)).decode("ascii"),
+            },
+            indent=2,
+        )
+        self.dirty = False
@@ -0,0 +1,27 @@
+# singleflight.py
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# key (biasanya URL upstream) → task yang sedang berjalan
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def single_flight(key: str, factory):
+    """Gabungkan pemanggilan serentak dengan key sama menjadi satu eksekusi.
+
+    `factory` adalah fungsi async tanpa argumen. Pemanggil yang datang saat
+    task untuk `key` masih berjalan ikut menunggu task itu dan mendapat hasil
+    (atau exception) yang sama.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.debug(f"🤝 Menumpang fetch yang sedang berjalan: {key}")
+
+    # shield: pembatalan satu pemanggil tidak membatalkan pemanggil lain
+    return await asyncio.shield(task)
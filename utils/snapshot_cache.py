@@ -0,0 +1,125 @@
+# snapshot_cache.py
+import time
+import asyncio
+import logging
+from utils.singleflight import single_flight
+from utils.metrics import cache_lookup
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER_FAIL = 60  # detik, jeda refresh setelah upstream gagal
+
+
+class SnapshotStore:
+    """Snapshot in-memory per sumber dengan TTL dan stale-while-revalidate.
+
+    - Umur < ttl            → langsung jawab dari memori.
+    - ttl ≤ umur < max_stale → jawab data lama, refresh di background.
+    - Umur ≥ max_stale/kosong → tunggu refresh (fallback ke data lama/disk).
+
+    File JSON hanya dipakai sebagai cadangan saat start dan ditulis ulang
+    ketika isi sumber benar-benar berubah.
+    """
+
+    def __init__(self):
+        self._sources = {}
+        self._data = {}
+        self._fetched_at = {}
+        self._failed_at = {}
+        self._tasks = set()
+
+    def register(self, key, fetch, *, ttl, max_stale, load, save, is_changed):
+        self._sources[key] = {
+            "fetch": fetch,
+            "ttl": ttl,
+            "max_stale": max_stale,
+            "load": load,
+            "save": save,
+            "is_changed": is_changed,
+        }
+
+    def _age(self, key):
+        fetched_at = self._fetched_at.get(key)
+        return float("inf") if fetched_at is None else time.monotonic() - fetched_at
+
+    def _load_fallback(self, key):
+        if key not in self._data:
+            try:
+                self._data[key] = self._sources[key]["load"]()
+            except Exception:
+                logger.warning(f"⚠️ Gagal memuat cache disk untuk {key}", exc_info=True)
+                self._data[key] = []
+        return self._data[key]
+
+    async def _refresh(self, key):
+        source = self._sources[key]
+        lama = self._load_fallback(key)
+        try:
+            baru = await source["fetch"]()
+        except Exception:
+            logger.error(f"❌ Refresh snapshot {key} gagal", exc_info=True)
+            baru = None
+
+        if not baru:
+            self._failed_at[key] = time.monotonic()
+            return lama
+        return self.put(key, baru)
+
+    def put(self, key, baru):
+        """Pasang data segar (dari refresh sendiri atau feed monitor)."""
+        source = self._sources[key]
+        lama = self._load_fallback(key)
+        if source["is_changed"](baru, lama):
+            logger.info(f"💾 Snapshot {key} berubah, simpan ke disk.")
+            source["save"](baru)
+        self._data[key] = baru
+        self._fetched_at[key] = time.monotonic()
+        self._failed_at.pop(key, None)
+        return baru
+
+    def refresh(self, key):
+        return single_flight(f"snapshot:{key}", lambda: self._refresh(key))
+
+    def _recently_failed(self, key):
+        failed_at = self._failed_at.get(key)
+        return failed_at is not None and time.monotonic() - failed_at < RETRY_AFTER_FAIL
+
+    def _refresh_background(self, key):
+        if self._recently_failed(key):
+            return
+        task = asyncio.ensure_future(self.refresh(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get(self, key):
+        """Ambil snapshot `key`, refresh bila perlu sesuai TTL-nya."""
+        source = self._sources[key]
+        age = self._age(key)
+
+        if age < source["ttl"]:
+            cache_lookup(f"snapshot:{key}", "hit")
+            return self._data[key]
+
+        data = self._load_fallback(key)
+        if data and (age < source["max_stale"] or self._recently_failed(key)):
+            cache_lookup(f"snapshot:{key}", "stale")
+            self._refresh_background(key)
+            return data
+
+        cache_lookup(f"snapshot:{key}", "miss")
+        if self._recently_failed(key):
+            return data
+        return await self.refresh(key)
+
+    async def refresh_due(self):
+        """Refresh semua sumber yang sudah lewat TTL (untuk job berkala)."""
+        due = [
+            key
+            for key, source in self._sources.items()
+            if self._age(key) >= source["ttl"] and not self._recently_failed(key)
+        ]
+        if due:
+            await asyncio.gather(*(self.refresh(key) for key in due))
+
+
+snapshots = SnapshotStore()
@@ -0,0 +1,170 @@
+# strike_tracker.py
+# Strike per user dengan timestamp numerik dan masa berlaku per strike.
+# Kedaluwarsa diproses lewat min-heap (O(log n) per strike), jadi biaya per
+# pesan tidak bergantung pada jumlah user yang punya strike. Snapshot ditulis
+# write-behind seperti JsonSetStore agar strike bertahan setelah restart.
+import json
+import time
+import heapq
+import logging
+from collections import deque
+from datetime import datetime
+from utils.constants import STRIKE_FILE
+from utils.persistence import FLUSH_THRESHOLD, atomic_write_json, register_store
+
+logger = logging.getLogger(__name__)
+
+# Masa berlaku strike ke-n (detik); strike berikutnya memakai durasi terakhir
+STRIKE_DURATIONS = {1: 24 * 3600, 2: 2 * 24 * 3600}
+HISTORY_MAX = 10  # riwayat per user untuk /cekstrike
+HISTORY_TTL = 30 * 24 * 3600  # riwayat lebih tua dari ini dibuang saat flush
+
+
+def durasi_strike(ke: int) -> int:
+    return STRIKE_DURATIONS.get(ke, STRIKE_DURATIONS[max(STRIKE_DURATIONS)])
+
+
+class StrikeTracker:
+    def __init__(self, path: str, threshold: int = FLUSH_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.pending = 0
+        self.writes = 0
+        self._active = {}  # user_id → [(ts, expiry), ...]
+        self._heap = []  # (expiry, user_id, ts); entri basi dibuang saat di-pop
+        self._history = {}  # user_id → deque[(ts, jenis, keterangan)]
+        self._load()
+
+    # === Persistensi ===
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError):
+            logger.warning(f"⚠️ Gagal memuat {self.path}, mulai kosong")
+            return
+
+        now = time.time()
+        for uid, strikes in data.get("aktif", {}).items():
+            for ts, expiry in strikes:
+                if expiry > now:
+                    self._active.setdefault(int(uid), []).append((ts, expiry))
+                    self._heap.append((expiry, int(uid), ts))
+        heapq.heapify(self._heap)
+        for uid, events in data.get("riwayat", {}).items():
+            self._history[int(uid)] = deque(
+                (tuple(e) for e in events), maxlen=HISTORY_MAX
+            )
+        logger.info(f"📦 {len(self._active)} user dengan strike aktif dimuat")
+
+    def _changed(self):
+        self.pending += 1
+        if self.pending >= self.threshold:
+            self.flush()
+
+    def flush(self):
+        """Tulis snapshot jika ada perubahan tertunda."""
+        now = time.time()
+        self.expire(now)
+        if not self.pending:
+            return
+        batas = now - HISTORY_TTL
+        for uid in [u for u, h in self._history.items() if h[-1][0] < batas]:
+            del self._history[uid]
+        try:
+            atomic_write_json(
+                self.path,
+                {
+                    "aktif": {str(u): s for u, s in self._active.items()},
+                    "riwayat": {str(u): list(h) for u, h in self._history.items()},
+                },
+            )
+        except Exception:
+            logger.error(f"❌ Gagal menulis {self.path}", exc_info=True)
+            return
+        self.pending = 0
+        self.writes += 1
+
+    # === Kedaluwarsa ===
+    def expire(self, now: float = None):
+        """Buang strike yang masa berlakunya lewat (hanya entri yang jatuh tempo)."""
+        now = time.time() if now is None else now
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expiry, uid, ts = heapq.heappop(heap)
+            strikes = self._active.get(uid)
+            if not strikes or (ts, expiry) not in strikes:
+                continue  # sudah direset
+            strikes.remove((ts, expiry))
+            if not strikes:
+                del self._active[uid]
+            self._log(uid, expiry, "kedaluwarsa", f"sisa {len(strikes)}")
+            self.pending += 1  # ditulis pada flush berikutnya
+
+    # === API ===
+    def _log(self, uid, ts, jenis: str, keterangan: str = ""):
+        riwayat = self._history.get(uid)
+        if riwayat is None:
+            riwayat = self._history[uid] = deque(maxlen=HISTORY_MAX)
+        riwayat.append((ts, jenis, keterangan))
+
+    def add(self, user_id: int, keterangan: str = "", now: float = None) -> int:
+        """Tambah satu strike; kembalikan jumlah strike aktif sesudahnya."""
+        now = time.time() if now is None else now
+        self.expire(now)
+        strikes = self._active.setdefault(user_id, [])
+        expiry = now + durasi_strike(len(strikes) + 1)
+        strikes.append((now, expiry))
+        heapq.heappush(self._heap, (expiry, user_id, now))
+        self._log(user_id, now, "strike", keterangan[:80])
+        self._changed()
+        return len(strikes)
+
+    def count(self, user_id: int, now: float = None) -> int:
+        self.expire(now)
+        return len(self._active.get(user_id, ()))
+
+    def next_expiry(self, user_id: int):
+        strikes = self._active.get(user_id)
+        return min(e for _, e in strikes) if strikes else None
+
+    def history(self, user_id: int) -> list:
+        """[(ts, jenis, keterangan)] terbaru di akhir."""
+        return list(self._history.get(user_id, ()))
+
+    def reset(self, user_id: int, oleh: str = "admin"):
+        # Entri heap milik user ini jadi basi dan dilewati saat di-pop
+        if self._active.pop(user_id, None):
+            self._log(user_id, time.time(), "reset", oleh)
+            self._changed()
+
+    def reset_all(self):
+        if self._active:
+            now = time.time()
+            for uid in self._active:
+                self._log(uid, now, "reset", "owner")
+            self._active.clear()
+            self._heap.clear()
+            self._changed()
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+
+JENIS = {"strike": "⚠️ Strike", "kedaluwarsa": "⌛ Kedaluwarsa", "reset": "🔄 Reset"}
+
+
+def format_history(riwayat: list) -> str:
+    baris = []
+    for ts, jenis, keterangan in reversed(riwayat):
+        waktu = datetime.fromtimestamp(ts).strftime("%d/%m %H:%M")
+        teks = f"• {waktu} {JENIS.get(jenis, jenis)}"
+        if keterangan:
+            teks += f" — {keterangan}"
+        baris.append(teks)
+    return "\n".join(baris)
+
+
+strikes = register_store(StrikeTracker(STRIKE_FILE))